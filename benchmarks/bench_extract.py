@@ -0,0 +1,135 @@
+import statistics
+import tempfile
+import time
+
+import click
+
+from anixart_playlist_extractor import AnixartPlaylistExtractor, Client
+from anixart_playlist_extractor.profiling import percentile
+from benchmarks.mock_server import MockConfig, MockServer
+
+
+def run_once(
+    server: MockServer,
+    *,
+    target: str,
+    max_workers: int,
+    output_dir: str,
+) -> float:
+    # NOTE: a fresh client per run, so every run pays for its own connections
+    with Client(
+        anixart_host=server.host,
+        kodik_host=server.host,
+        scheme="http",
+        pool_size=max(max_workers, 10),
+    ) as client:
+        extractor = AnixartPlaylistExtractor(client, max_workers=max_workers)
+        start = time.perf_counter()
+
+        match target:
+            case "get_playlist":
+                extractor.get_playlist(1, 1)
+            case "extract_playlist":
+                extractor.extract_playlist(1, 1, output_dir=output_dir)
+
+        return time.perf_counter() - start
+
+
+def split_ints(ctx, param, value: str) -> list[int]:
+    try:
+        return [int(item) for item in value.split(",") if item]
+    except ValueError:
+        raise click.BadParameter("expected comma-separated integers")
+
+
+@click.command(help="End-to-end extraction against a local Anixart/Kodik stand-in")
+@click.option(
+    "-e",
+    "--episodes",
+    show_default=True,
+    default="1,12,24,100",
+    help="Episode counts to benchmark (comma-separated)",
+    callback=split_ints,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default="1,8",
+    help="Worker counts to benchmark (comma-separated)",
+    callback=split_ints,
+)
+@click.option(
+    "-t",
+    "--target",
+    show_default=True,
+    default=("get_playlist", "extract_playlist"),
+    multiple=True,
+    type=click.Choice(["get_playlist", "extract_playlist"]),
+)
+@click.option(
+    "-l",
+    "--latency",
+    show_default=True,
+    default=0.05,
+    help="Per-request latency of the mock server, seconds",
+    type=click.FLOAT,
+)
+@click.option(
+    "-s",
+    "--payload-size",
+    show_default=True,
+    default=0,
+    help="Approximate extra bytes in release payloads",
+    type=click.INT,
+)
+@click.option(
+    "-r",
+    "--repeat",
+    show_default=True,
+    default=5,
+    help="Runs per case",
+    type=click.IntRange(min=1),
+)
+def main(
+    episodes: list[int],
+    jobs: list[int],
+    target: tuple[str, ...],
+    latency: float,
+    payload_size: int,
+    repeat: int,
+) -> None:
+    click.echo(
+        f"{'target':<17} {'episodes':>8} {'jobs':>4} "
+        f"{'p50, s':>8} {'p95, s':>8} {'max, s':>8} {'episodes/s':>10}"
+    )
+
+    for episodes_count in episodes:
+        config = MockConfig(
+            episodes=episodes_count,
+            latency=latency,
+            payload_size=payload_size,
+        )
+
+        with MockServer(config) as server, tempfile.TemporaryDirectory() as output_dir:
+            for name in target:
+                for max_workers in jobs:
+                    times = [
+                        run_once(
+                            server,
+                            target=name,
+                            max_workers=max_workers,
+                            output_dir=output_dir,
+                        )
+                        for _ in range(repeat)
+                    ]
+                    click.echo(
+                        f"{name:<17} {episodes_count:>8} {max_workers:>4} "
+                        f"{statistics.median(times):>8.3f} "
+                        f"{percentile(times, 0.95):>8.3f} {max(times):>8.3f} "
+                        f"{episodes_count / statistics.median(times):>10.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
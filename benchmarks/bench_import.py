@@ -0,0 +1,68 @@
+import re
+import statistics
+import subprocess
+import sys
+
+import click
+
+# NOTE: cumulative import time budgets, milliseconds
+BUDGETS: dict[str, float] = {
+    "anixart_playlist_extractor": 10.0,
+    "anixart_playlist_extractor.cli": 50.0,
+}
+
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def measure_import(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    for match in IMPORT_TIME_PATTERN.finditer(result.stderr):
+        if not match[2] and match[3] == module:
+            return int(match[1]) / 1000
+
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+@click.command(help="Check cumulative import times of the package and the CLI")
+@click.option(
+    "-r",
+    "--repeat",
+    show_default=True,
+    default=5,
+    help="Runs per module",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "-m",
+    "--module",
+    "modules",
+    multiple=True,
+    help="Extra modules to report (without a budget)",
+)
+def main(repeat: int, modules: tuple[str, ...]) -> None:
+    exceeded = False
+
+    for module in (*BUDGETS, *modules):
+        elapsed = statistics.median(measure_import(module) for _ in range(repeat))
+        budget = BUDGETS.get(module)
+
+        if budget is None:
+            click.echo(f"{module:<40} {elapsed:>8.1f} ms")
+            continue
+
+        status = "OK" if elapsed <= budget else "OVER"
+        exceeded = exceeded or elapsed > budget
+        click.echo(f"{module:<40} {elapsed:>8.1f} ms (budget {budget:.0f} ms) {status}")
+
+    if exceeded:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
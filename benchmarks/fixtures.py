@@ -0,0 +1,157 @@
+RELEASE_FIELDS = (
+    "poster image year genres country director author translators studio "
+    "description note related rating grade status duration season broadcast "
+    "screenshots title_original title_alt episodes_released episodes_total "
+    "release_date vote_1_count vote_2_count vote_3_count vote_4_count vote_5_count "
+    "vote_count creation_date last_update_date aired_on_date favorites_count "
+    "watching_count plan_count completed_count hold_on_count dropped_count is_adult "
+    "is_play_disabled is_tpp_disabled can_video_appeal can_torlook_search "
+    "is_deleted age_rating your_vote related_count comment_count comments_count "
+    "collection_count profile_list_status status_id last_view_timestamp "
+    "last_view_episode is_viewed is_favorite is_view_blocked episode_last_update "
+    "comment_per_day_count profile_release_type_notification_preference_count "
+    "is_release_type_notifications_enabled"
+).split()
+
+KODIK_EXPIRY = 4102444800  # NOTE: 2100-01-01, links never expire during a run
+
+
+def comment(comment_id: int, release_id: int, *, size: int = 200) -> dict:
+    return {
+        "id": comment_id,
+        "profile": None,
+        "message": "x" * size,
+        "timestamp": 1700000000,
+        "type": 0,
+        "vote": 0,
+        "release": release_id,
+        "parent_comment_id": None,
+        "vote_count": 0,
+        "likes_count": 0,
+        "is_spoiler": False,
+        "is_edited": False,
+        "is_deleted": False,
+        "is_reply": False,
+        "reply_count": 0,
+        "can_like": True,
+    }
+
+
+def release(release_id: int, *, episodes: int = 12, payload_size: int = 0) -> dict:
+    # NOTE: `payload_size` bytes are spread over comments and related releases,
+    # the way real releases get heavy
+    fields = dict.fromkeys(RELEASE_FIELDS)
+    fields.update(
+        {
+            "@id": 1,
+            "id": release_id,
+            "category": 1,
+            "title_ru": f"Релиз {release_id}",
+            "title_original": f"Release {release_id}",
+            "description": "Описание релиза",
+            "episodes_released": episodes,
+            "episodes_total": episodes,
+            "last_update_date": 1700000000,
+            "comments": [
+                comment(index, release_id) for index in range(payload_size // 800)
+            ],
+            "screenshot_images": [],
+            "related_releases": [
+                {**dict.fromkeys(RELEASE_FIELDS), **stub_release(release_id + index)}
+                for index in range(1, payload_size // 3200 + 1)
+            ],
+            "recommended_releases": [],
+            "video_banners": [],
+        }
+    )
+    return fields
+
+
+def stub_release(release_id: int) -> dict:
+    return {
+        "@id": release_id + 1,
+        "id": release_id,
+        "category": 1,
+        "title_ru": f"Релиз {release_id}",
+        "comments": [],
+        "screenshot_images": [],
+        "related_releases": [],
+        "recommended_releases": [],
+        "video_banners": [],
+    }
+
+
+def episode_type(type_id: int) -> dict:
+    return {
+        "@id": type_id,
+        "id": type_id,
+        "name": f"Озвучка {type_id}",
+        "icon": None,
+        "workers": None,
+        "is_sub": False,
+        "episodes_count": 12,
+        "view_count": 0,
+        "pinned": False,
+    }
+
+
+def source(source_id: int, type_id: int, *, episodes: int = 12) -> dict:
+    return {
+        "@id": source_id,
+        "id": source_id,
+        "type": type_id,
+        "name": "Kodik",
+        "episodes_count": episodes,
+    }
+
+
+def episode(
+    release_id: int,
+    source_id: int,
+    position: int,
+    *,
+    kodik_host: str,
+) -> dict:
+    return {
+        "@id": position,
+        "position": position,
+        "release": release_id,
+        "source": source_id,
+        "name": f"{position} серия",
+        "url": (
+            f"//{kodik_host}/seria/{release_id}{position:04}/"
+            f"{source_id:x}{position:08x}/720p"
+            f"?d=kodik.info&s={source_id:x}{position:08x}&ip=127.0.0.1"
+        ),
+        "iframe": True,
+        "addedDate": 1700000000,
+        "is_filler": False,
+        "is_watched": False,
+    }
+
+
+def episode_update(page: int, index: int) -> dict:
+    type_id = (page * 7 + index) % 20 + 1
+    return {
+        "last_episode_update_date": 1700000000,
+        "last_episode_update_name": f"{index + 1} серия",
+        "last_episode_source_update_id": 1,
+        "last_episode_source_update_name": "Kodik",
+        "last_episode_type_update_id": type_id,
+        "lastEpisodeTypeUpdateName": f"Озвучка {type_id}",
+    }
+
+
+def video_links(s: str) -> dict:
+    return {
+        "links": {
+            quality: {
+                "Src": (
+                    f"//cloud.kodik-storage.com/useruploads/{s}/"
+                    f"0123456789abcdef:{KODIK_EXPIRY}/{quality}.mp4:hls:manifest.m3u8"
+                ),
+                "Type": "application/x-mpegURL",
+            }
+            for quality in ("360", "480", "720")
+        }
+    }
@@ -0,0 +1,220 @@
+import json
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import click
+
+from benchmarks import fixtures
+
+
+class MockConfig:
+    def __init__(
+        self,
+        *,
+        episodes: int = 12,
+        latency: float = 0.05,
+        kodik_latency: float | None = None,
+        payload_size: int = 0,
+        update_pages: int = 5,
+        sources: int = 1,
+        source_episodes: dict[int, int] | None = None,
+        source_latencies: dict[int, float] | None = None,
+    ) -> None:
+        self.episodes: int = episodes
+        self.latency: float = latency
+        self.kodik_latency: float = (
+            kodik_latency if kodik_latency is not None else latency
+        )
+        self.payload_size: int = payload_size
+        self.update_pages: int = update_pages
+        self.sources: int = sources
+        # NOTE: per source id overrides of the episode count and extra Kodik latency
+        self.source_episodes: dict[int, int] = source_episodes or {}
+        self.source_latencies: dict[int, float] = source_latencies or {}
+
+    def get_episodes(self, source_id: int) -> int:
+        return self.source_episodes.get(source_id, self.episodes)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # NOTE: keep-alive, so the client connection pool behaves as with the real hosts
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    server: "MockServer"
+
+    def log_message(self, format, *args) -> None: ...
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        body = self.route(url.path, parse_qs(url.query))
+        self.server.count(url.path)
+
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = json.dumps(body).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def route(self, path: str, query: dict[str, list[str]]) -> dict | None:
+        config = self.server.config
+        host = self.headers["Host"]
+
+        if path == "/api/video-links":
+            s = query.get("s", [""])[0]
+            # NOTE: `s` is `<source_id:x><position:08x>`, see `fixtures.episode`
+            source_id = int(s[:-8] or "0", 16)
+            time.sleep(config.kodik_latency + config.source_latencies.get(source_id, 0))
+            return fixtures.video_links(s)
+
+        time.sleep(config.latency)
+
+        if match := re.fullmatch(r"/release/(\d+)", path):
+            return {
+                "code": 0,
+                "release": fixtures.release(
+                    int(match[1]),
+                    episodes=config.episodes,
+                    payload_size=config.payload_size,
+                ),
+            }
+
+        if match := re.fullmatch(r"/episode/target/(\d+)/(\d+)/(\d+)", path):
+            return {
+                "code": 0,
+                "episode": fixtures.episode(
+                    int(match[1]),
+                    int(match[2]),
+                    int(match[3]),
+                    kodik_host=host,
+                ),
+            }
+
+        if match := re.fullmatch(r"/episode/updates/(\d+)/(\d+)", path):
+            page = int(match[2])
+            return {
+                "code": 0,
+                "content": (
+                    [fixtures.episode_update(page, index) for index in range(25)]
+                    if page < config.update_pages
+                    else []
+                ),
+                "total_count": config.update_pages * 25,
+                "total_page_count": config.update_pages,
+                "current_page": page,
+            }
+
+        if match := re.fullmatch(r"/episode/(\d+)/(\d+)/(\d+)", path):
+            return {
+                "code": 0,
+                "episodes": [
+                    fixtures.episode(
+                        int(match[1]),
+                        int(match[3]),
+                        position,
+                        kodik_host=host,
+                    )
+                    for position in range(1, config.get_episodes(int(match[3])) + 1)
+                ],
+            }
+
+        if match := re.fullmatch(r"/episode/(\d+)/(\d+)", path):
+            return {
+                "code": 0,
+                "sources": [
+                    fixtures.source(
+                        source_id,
+                        int(match[2]),
+                        episodes=config.get_episodes(source_id),
+                    )
+                    for source_id in range(1, config.sources + 1)
+                ],
+            }
+
+        if match := re.fullmatch(r"/episode/(\d+)", path):
+            return {
+                "code": 0,
+                "types": [fixtures.episode_type(type_id) for type_id in range(1, 6)],
+            }
+
+        if path == "/type/all":
+            return {
+                "code": 0,
+                "types": [fixtures.episode_type(type_id) for type_id in range(1, 101)],
+            }
+
+        return None
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        config: MockConfig | None = None,
+        *,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+    ) -> None:
+        super().__init__(address, MockHandler)
+        self.config: MockConfig = config if config is not None else MockConfig()
+        self.counts: dict[str, int] = {}
+        self.lock: threading.Lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    @property
+    def host(self) -> str:
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+    def count(self, path: str) -> None:
+        with self.lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+
+    def start(self) -> "MockServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.stop()
+
+
+@click.command(help="Serve fixture Anixart/Kodik responses for manual runs")
+@click.option("-p", "--port", show_default=True, default=8080, type=click.INT)
+@click.option("-e", "--episodes", show_default=True, default=12, type=click.INT)
+@click.option("-l", "--latency", show_default=True, default=0.05, type=click.FLOAT)
+@click.option("-s", "--payload-size", show_default=True, default=0, type=click.INT)
+def main(port: int, episodes: int, latency: float, payload_size: int) -> None:
+    server = MockServer(
+        MockConfig(episodes=episodes, latency=latency, payload_size=payload_size),
+        address=("127.0.0.1", port),
+    )
+    click.echo(f"Serving on http://{server.host}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
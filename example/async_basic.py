@@ -0,0 +1,8 @@
+import asyncio
+
+from anixart_playlist_extractor import extract_playlist_async
+
+if __name__ == "__main__":
+    # Release ID:   18093   (Магическая битва 0. Фильм)
+    # Type ID:      46      (Субтитры | CR)
+    asyncio.run(extract_playlist_async(18093, 46))
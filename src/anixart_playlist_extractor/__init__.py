@@ -1,15 +1,104 @@
-from .anixart_playlist_extractor import (
-    AnixartPlaylistExtractor,
-    print_types,
-    extract_playlist,
-)
-from .client import Client
-from .enums import Quality
-
-__all__ = (
-    AnixartPlaylistExtractor,
-    Client,
-    Quality,
-    print_types,
-    extract_playlist,
-)
+import importlib
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .anixart_playlist_extractor import (
+        AnixartPlaylistExtractor,
+        print_types,
+        extract_playlist,
+        extract_playlists,
+        refresh_playlists,
+        export_playlist,
+    )
+    from .async_anixart_playlist_extractor import (
+        AsyncAnixartPlaylistExtractor,
+        extract_playlist_async,
+    )
+    from .async_client import AsyncClient
+    from .batch import BatchJob, extract_batch, extract_manifest, load_manifest
+    from .client import Client
+    from .enums import Quality
+    from .exceptions import (
+        AnixartPlaylistExtractorError,
+        AnixartResponseError,
+        CircuitOpenError,
+        DeadlineExceededError,
+        EpisodeResolutionError,
+        HTTPStatusError,
+        NoSourcesError,
+        RequestDeadlineError,
+        RequestError,
+        ResponseParseError,
+    )
+    from .host_policy import HostPolicy, RetryPolicy
+    from .metadata_store import MetadataStore
+    from .profiling import Profiler
+    from .server import PlaylistServer, serve
+    from .source_selection import SourceChoiceStore
+    from .sync import sync_store
+    from .type_catalog import TypeCatalog, load_type_catalog
+    from .watch import Watcher, watch_manifest
+    from .work_queue import SQLiteWorkQueue, WorkQueue, Worker, run_worker
+
+# NOTE: submodules (requests, aiohttp, pydantic models) are imported on first access,
+# so the CLI only pays for what a command actually uses
+LAZY_IMPORTS: dict[str, str] = {
+    "AnixartPlaylistExtractor": ".anixart_playlist_extractor",
+    "AsyncAnixartPlaylistExtractor": ".async_anixart_playlist_extractor",
+    "AsyncClient": ".async_client",
+    "BatchJob": ".batch",
+    "Client": ".client",
+    "HostPolicy": ".host_policy",
+    "RetryPolicy": ".host_policy",
+    "MetadataStore": ".metadata_store",
+    "Profiler": ".profiling",
+    "PlaylistServer": ".server",
+    "SourceChoiceStore": ".source_selection",
+    "TypeCatalog": ".type_catalog",
+    "Watcher": ".watch",
+    "WorkQueue": ".work_queue",
+    "SQLiteWorkQueue": ".work_queue",
+    "Worker": ".work_queue",
+    "Quality": ".enums",
+    "AnixartPlaylistExtractorError": ".exceptions",
+    "AnixartResponseError": ".exceptions",
+    "CircuitOpenError": ".exceptions",
+    "DeadlineExceededError": ".exceptions",
+    "EpisodeResolutionError": ".exceptions",
+    "HTTPStatusError": ".exceptions",
+    "NoSourcesError": ".exceptions",
+    "RequestDeadlineError": ".exceptions",
+    "RequestError": ".exceptions",
+    "ResponseParseError": ".exceptions",
+    "print_types": ".anixart_playlist_extractor",
+    "extract_playlist": ".anixart_playlist_extractor",
+    "extract_playlists": ".anixart_playlist_extractor",
+    "refresh_playlists": ".anixart_playlist_extractor",
+    "export_playlist": ".anixart_playlist_extractor",
+    "extract_playlist_async": ".async_anixart_playlist_extractor",
+    "extract_batch": ".batch",
+    "extract_manifest": ".batch",
+    "load_manifest": ".batch",
+    "load_type_catalog": ".type_catalog",
+    "watch_manifest": ".watch",
+    "run_worker": ".work_queue",
+    "serve": ".server",
+    "sync_store": ".sync",
+}
+
+
+def __getattr__(name: str):
+    if name not in LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *LAZY_IMPORTS})
+
+
+__all__ = tuple(LAZY_IMPORTS)
@@ -1,29 +1,116 @@
 import os
+import sys
+import time
 
-from urllib.parse import urlparse
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Callable, Iterable, Iterator, TextIO
 
-from anixart_playlist_extractor.client import Client
+from anixart_playlist_extractor import (
+    jsonl_playlist_builder,
+    m3u_playlist_builder,
+    vlc_playlist_builder,
+)
+from anixart_playlist_extractor.cache import ResponseCache
+from anixart_playlist_extractor.client import DEFAULT_POOL_SIZE, Client
 from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.exceptions import (
+    DeadlineExceededError,
+    EpisodeResolutionError,
+    NoSourcesError,
+    RequestDeadlineError,
+)
+from anixart_playlist_extractor.metadata_store import MetadataStore
 from anixart_playlist_extractor.models import (
     AnixartResponse,
-    EpisodeUpdate,
+    EpisodeSummary,
+    EpisodeSummaryResponse,
+    EpisodesSummaryResponse,
     Playlist,
+    PlaylistPlan,
     PlaylistVideo,
+    ReleaseSummary,
+    ReleaseSummaryResponse,
     Type,
 )
-from anixart_playlist_extractor.vlc_playlist_builder import build_playlist
+from anixart_playlist_extractor.playlist_manifest import (
+    PlaylistManifest,
+    find_playlist_manifest,
+    get_playlist_manifest_path,
+    index_playlist_manifests,
+    read_playlist_manifest,
+    write_playlist_manifest,
+)
+from anixart_playlist_extractor.profiling import (
+    PhaseEvent,
+    PhaseHook,
+    Profiler,
+    emit,
+    measure_phase,
+)
+from anixart_playlist_extractor.source_selection import (
+    SourceChoice,
+    SourceChoiceStore,
+    SourceProbe,
+    choose_source,
+    default_source_choices_path,
+    probe_sources,
+)
+from anixart_playlist_extractor.type_catalog import (
+    TypeCatalog,
+    default_type_catalog_path,
+    list_release_types,
+    load_type_catalog,
+)
+from anixart_playlist_extractor.utils import (
+    assert_code,
+    clean_filename,
+    get_video_link,
+    parse_episode_url,
+    atomic_write,
+    get_expires_at,
+    get_remaining,
+    select_episodes,
+    stop_at_deadline,
+)
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+# NOTE: keys are also the file extensions
+PLAYLIST_WRITERS = {
+    "xspf": vlc_playlist_builder.XSPFWriter,
+    "m3u": m3u_playlist_builder.M3UWriter,
+    "jsonl": jsonl_playlist_builder.JSONLWriter,
+}
 
 
 class AnixartPlaylistExtractor:
-    def __init__(self, client: Client = None) -> None:
+    def __init__(
+        self,
+        client: Client = None,
+        *,
+        max_workers: int = 1,
+        hooks: list[PhaseHook] | None = None,
+        source_choices: SourceChoiceStore | None = None,
+        store: MetadataStore | None = None,
+    ) -> None:
         self.client: Client = client if client is not None else Client()
+        self.max_workers: int = max_workers
+        self.hooks: list[PhaseHook] = list(hooks or [])
+        # NOTE: without a store the first source is used, as listed by Anixart
+        self.source_choices: SourceChoiceStore | None = source_choices
+        self.store: MetadataStore | None = store
 
     def assert_code[ResponseModel: AnixartResponse](
         self,
         response: ResponseModel,
     ) -> None:
-        if response.code != 0:
-            raise Exception(f"Got AnixartResponse with error code: {response.code}")
+        assert_code(response)
 
     def clean_filename(
         self,
@@ -31,48 +118,38 @@ class AnixartPlaylistExtractor:
         *,
         replace_char: str = "",
     ) -> str:
-        illegal_chars = r'<>:"/\|?*'
-
-        for illegal_char in illegal_chars:
-            filename = filename.replace(illegal_char, replace_char)
-
-        return filename
+        return clean_filename(filename, replace_char=replace_char)
 
     def get_location(
         self,
         url: str,
         *,
         quality: Quality = Quality.q720,
+        expires_at: float | None = None,
     ) -> str:
-        parse_result = urlparse(url)
-
-        netloc = parse_result.netloc
-        path = parse_result.path
-        params = {
-            key: value
-            for key, value in map(
-                lambda param: tuple(param.split("=")),
-                parse_result.query.split("&"),
-            )
-        }
+        return self.get_locations(
+            url,
+            qualities=[quality],
+            expires_at=expires_at,
+        )[quality]
 
+    def get_locations(
+        self,
+        url: str,
+        *,
+        qualities: list[Quality],
+        expires_at: float | None = None,
+    ) -> dict[Quality, str]:
+        # NOTE: Kodik returns every quality at once
         video_links = self.client.get_video_links(
-            f"//{netloc}{path}",
-            params["d"],
-            params["s"],
-            params["ip"],
+            *parse_episode_url(url),
+            expires_at=expires_at,
         )
 
-        # TODO: find easier way to get `Src` field
-        match quality:
-            case Quality.q360:
-                video_link = video_links.links.field_360.Src
-            case Quality.q480:
-                video_link = video_links.links.field_480.Src
-            case Quality.q720:
-                video_link = video_links.links.field_720.Src
-
-        return f"https:{video_link}"
+        return {
+            quality: get_video_link(video_links, quality=quality)
+            for quality in qualities
+        }
 
     def get_playlist_video(
         self,
@@ -81,70 +158,492 @@ class AnixartPlaylistExtractor:
         position: int,
         *,
         quality: Quality = Quality.q720,
+        expires_at: float | None = None,
     ) -> PlaylistVideo:
-        episode = self.client.get_episode(release_id, source_id, position)
+        return self.get_playlist_video_qualities(
+            release_id,
+            source_id,
+            position,
+            qualities=[quality],
+            expires_at=expires_at,
+        )[quality]
+
+    def get_playlist_video_qualities(
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+        *,
+        qualities: list[Quality],
+        expires_at: float | None = None,
+    ) -> dict[Quality, PlaylistVideo]:
+        with measure_phase(self.hooks, "episode"):
+            episode = self.get_episode_summary(
+                release_id,
+                source_id,
+                position,
+                expires_at=expires_at,
+            )
+
+            return {
+                quality: PlaylistVideo(
+                    id=episode.position,
+                    title=episode.name,
+                    location=location,
+                    url=episode.url,
+                )
+                for quality, location in self.get_locations(
+                    episode.url,
+                    qualities=qualities,
+                    expires_at=expires_at,
+                ).items()
+            }
+
+    def get_episode_summary(
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+        *,
+        expires_at: float | None = None,
+    ) -> EpisodeSummary:
+        if self.store is not None and (
+            episode := self.store.get_episode(release_id, source_id, position)
+        ):
+            return episode
+
+        episode = self.client.get_episode(
+            release_id,
+            source_id,
+            position,
+            response_model=EpisodeSummaryResponse,
+            expires_at=expires_at,
+        )
 
         self.assert_code(episode)
 
-        return PlaylistVideo(
-            id=episode.episode.position,
-            title=episode.episode.name,
-            location=self.get_location(
-                episode.episode.url,
+        return episode.episode
+
+    def iter_playlist_videos(
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        *,
+        quality: Quality = Quality.q720,
+        ordered: bool = True,
+        expires_at: float | None = None,
+    ) -> Iterator[PlaylistVideo]:
+        return self.iter_resolved(
+            release_id,
+            source_id,
+            positions,
+            lambda position: self.get_playlist_video(
+                release_id,
+                source_id,
+                position,
                 quality=quality,
+                expires_at=expires_at,
             ),
+            ordered=ordered,
+            expires_at=expires_at,
         )
 
-    def get_playlist(
+    def iter_playlist_video_qualities(
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        *,
+        qualities: list[Quality],
+        ordered: bool = True,
+        expires_at: float | None = None,
+    ) -> Iterator[dict[Quality, PlaylistVideo]]:
+        return self.iter_resolved(
+            release_id,
+            source_id,
+            positions,
+            lambda position: self.get_playlist_video_qualities(
+                release_id,
+                source_id,
+                position,
+                qualities=qualities,
+                expires_at=expires_at,
+            ),
+            ordered=ordered,
+            expires_at=expires_at,
+        )
+
+    def iter_resolved[Resolved](
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        resolve: Callable[[int], Resolved],
+        *,
+        ordered: bool = True,
+        expires_at: float | None = None,
+    ) -> Iterator[Resolved]:
+        if self.max_workers <= 1 or len(positions) <= 1:
+            for index, position in enumerate(positions):
+                if expires_at is not None and time.monotonic() >= expires_at:
+                    raise DeadlineExceededError(
+                        release_id=release_id,
+                        source_id=source_id,
+                        missing=positions[index:],
+                    )
+                try:
+                    resolved = resolve(position)
+                # NOTE: the request in flight gave up as it could not finish in time
+                except RequestDeadlineError:
+                    raise DeadlineExceededError(
+                        release_id=release_id,
+                        source_id=source_id,
+                        missing=positions[index:],
+                    ) from None
+                except Exception as exception:
+                    raise EpisodeResolutionError(
+                        release_id=release_id,
+                        source_id=source_id,
+                        position=position,
+                        reason=exception,
+                    ) from exception
+                yield resolved
+            return
+
+        # NOTE: an episode whose request gave up at the deadline is missing, not failed
+        def is_failed(future: Future) -> bool:
+            exception = future.exception()
+            return exception is not None and not isinstance(
+                exception,
+                RequestDeadlineError,
+            )
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(positions)))
+
+        try:
+            futures = [executor.submit(resolve, position) for position in positions]
+            positions_by_future = dict(zip(futures, positions))
+
+            # NOTE: unordered, every episode is yielded the moment it is resolved
+            if not ordered:
+                yielded = set()
+                try:
+                    for future in as_completed(
+                        futures,
+                        timeout=get_remaining(expires_at),
+                    ):
+                        if is_failed(future):
+                            raise EpisodeResolutionError(
+                                release_id=release_id,
+                                source_id=source_id,
+                                position=positions_by_future[future],
+                                reason=future.exception(),
+                            ) from future.exception()
+                        if future.exception() is None:
+                            yielded.add(future)
+                            yield future.result()
+                except TimeoutError:
+                    pass
+
+                if missing := [
+                    position
+                    for future, position in positions_by_future.items()
+                    if future not in yielded
+                ]:
+                    raise DeadlineExceededError(
+                        release_id=release_id,
+                        source_id=source_id,
+                        missing=missing,
+                    )
+                return
+
+            pending = set(futures)
+            missing = []
+            index = 0
+
+            while index < len(futures):
+                # NOTE: yield in position order as soon as the next video is resolved,
+                # but fail on the first error regardless of its position
+                if not futures[index].done():
+                    done, pending = wait(
+                        pending,
+                        timeout=get_remaining(expires_at),
+                        return_when=FIRST_COMPLETED,
+                    )
+
+                    # NOTE: at the deadline the videos resolved out of order are
+                    # yielded too, the rest are cancelled and reported as missing
+                    if not done:
+                        for future in futures[index:]:
+                            if future.done() and future.exception() is None:
+                                yield future.result()
+                            else:
+                                missing.append(positions_by_future[future])
+                        break
+
+                    failed = sorted(
+                        (positions_by_future[future], future)
+                        for future in done
+                        if is_failed(future)
+                    )
+                    if failed:
+                        position, future = failed[0]
+                        raise EpisodeResolutionError(
+                            release_id=release_id,
+                            source_id=source_id,
+                            position=position,
+                            reason=future.exception(),
+                        ) from future.exception()
+
+                while index < len(futures) and futures[index].done():
+                    if futures[index].exception() is None:
+                        yield futures[index].result()
+                    else:
+                        missing.append(positions[index])
+                    index += 1
+
+            if missing:
+                raise DeadlineExceededError(
+                    release_id=release_id,
+                    source_id=source_id,
+                    missing=missing,
+                )
+        finally:
+            # NOTE: running workers are not waited for, but their requests are bound
+            # by the deadline as well, so they give up shortly after it
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_playlist_videos(
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        *,
+        quality: Quality = Quality.q720,
+    ) -> list[PlaylistVideo]:
+        return list(
+            self.iter_playlist_videos(
+                release_id,
+                source_id,
+                positions,
+                quality=quality,
+            )
+        )
+
+    def plan_playlist(
         self,
         release_id: int,
         type_id: int,
         *,
         extract_only: list[int] | None = None,
         extract_last: bool | None = None,
-        quality: Quality = Quality.q720,
-    ) -> Playlist:
-        release = self.client.get_release(release_id)
+        expires_at: float | None = None,
+    ) -> PlaylistPlan:
+        with measure_phase(self.hooks, "plan"):
+            return self._plan_playlist(
+                release_id,
+                type_id,
+                extract_only=extract_only,
+                extract_last=extract_last,
+                expires_at=expires_at,
+            )
+
+    def _plan_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        expires_at: float | None = None,
+    ) -> PlaylistPlan:
+        release = self.get_release_summary(release_id, expires_at=expires_at)
+        source_ids = self.get_source_ids(release_id, type_id, expires_at=expires_at)
+
+        if len(source_ids) < 1:
+            raise NoSourcesError(release_id=release_id, type_id=type_id)
+
+        source = self.select_source(
+            release_id,
+            type_id,
+            source_ids,
+            expires_at=expires_at,
+        )
+        source_id, episodes = source.source_id, source.episodes
+
+        if episodes is None:
+            episodes = self.get_episode_summaries(
+                release_id,
+                type_id,
+                source_id,
+                expires_at=expires_at,
+            )
+
+        episodes = select_episodes(
+            episodes,
+            extract_only=extract_only,
+            extract_last=extract_last,
+        )
+
+        return PlaylistPlan(
+            release_id=release_id,
+            type_id=type_id,
+            source_id=source_id,
+            title=release.title_ru,
+            positions=[episode.position for episode in episodes],
+            titles={episode.position: episode.name for episode in episodes},
+        )
+
+    # NOTE: with a metadata store, the plan is read from it and only what is missing
+    # is requested from Anixart (and written back)
+    def get_release_summary(
+        self,
+        release_id: int,
+        *,
+        expires_at: float | None = None,
+    ) -> ReleaseSummary:
+        if self.store is not None and (release := self.store.get_release(release_id)):
+            return release
+
+        release = self.client.get_release(
+            release_id,
+            response_model=ReleaseSummaryResponse,
+            expires_at=expires_at,
+        )
 
         self.assert_code(release)
 
-        episode_sources = self.client.get_episode_sources(release_id, type_id)
+        if self.store is not None:
+            self.store.put_release(release.release)
+
+        return release.release
+
+    def get_source_ids(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        expires_at: float | None = None,
+    ) -> list[int]:
+        if self.store is not None and (
+            source_ids := self.store.get_source_ids(release_id, type_id)
+        ):
+            return source_ids
+
+        episode_sources = self.client.get_episode_sources(
+            release_id,
+            type_id,
+            expires_at=expires_at,
+        )
 
         self.assert_code(episode_sources)
 
-        if len(episode_sources.sources) < 1:
-            raise Exception(
-                f"No sources for TypeID: {type_id} (ReleaseID: {release_id})"
-            )
+        if self.store is not None:
+            self.store.put_sources(release_id, type_id, episode_sources.sources)
+
+        return [source.id for source in episode_sources.sources]
+
+    def get_episode_summaries(
+        self,
+        release_id: int,
+        type_id: int,
+        source_id: int,
+        *,
+        expires_at: float | None = None,
+    ) -> list[EpisodeSummary]:
+        if self.store is not None and (
+            episodes := self.store.get_episodes(release_id, type_id, source_id)
+        ):
+            return episodes
 
-        source_id = episode_sources.sources[0].id
-        episodes = self.client.get_episodes(release_id, type_id, source_id)
+        episodes = self.client.get_episodes(
+            release_id,
+            type_id,
+            source_id,
+            response_model=EpisodesSummaryResponse,
+            expires_at=expires_at,
+        )
 
         self.assert_code(episodes)
 
-        episodes = (
-            episodes.episodes[-1:]
-            if extract_last
-            else filter(
-                lambda episode: episode.position in extract_only,
-                episodes.episodes,
+        if self.store is not None:
+            self.store.put_episodes(release_id, type_id, source_id, episodes.episodes)
+
+        return episodes.episodes
+
+    def select_source(
+        self,
+        release_id: int,
+        type_id: int,
+        source_ids: list[int],
+        *,
+        expires_at: float | None = None,
+    ) -> SourceProbe:
+        if self.source_choices is None or len(source_ids) == 1:
+            return SourceProbe(source_id=source_ids[0])
+
+        choice = self.source_choices.get(release_id, type_id)
+        if choice is not None and choice.source_id in source_ids:
+            return SourceProbe(source_id=choice.source_id)
+
+        with measure_phase(self.hooks, "probe"):
+            probe = choose_source(
+                probe_sources(
+                    self.client,
+                    release_id,
+                    type_id,
+                    source_ids,
+                    expires_at=expires_at,
+                )
             )
-            if extract_only
-            else episodes.episodes
+
+        # NOTE: no source answered, fall back to the first one without remembering it
+        if probe is None:
+            return SourceProbe(source_id=source_ids[0])
+
+        # NOTE: probes cut short by the deadline prove nothing about the other sources
+        if get_remaining(expires_at) == 0:
+            return probe
+
+        self.source_choices.set(
+            release_id,
+            type_id,
+            SourceChoice(
+                source_id=probe.source_id,
+                episodes=len(probe.episodes),
+                latency=probe.latency,
+                chosen_at=time.time(),
+            ),
         )
 
-        videos: list[PlaylistVideo] = [
-            self.get_playlist_video(
-                release_id,
-                source_id,
-                episode.position,
-                quality=quality,
-            )
-            for episode in episodes
-        ]
+        return probe
+
+    def get_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        quality: Quality = Quality.q720,
+    ) -> Playlist:
+        plan = self.plan_playlist(
+            release_id,
+            type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+        )
+
+        videos = self.get_playlist_videos(
+            plan.release_id,
+            plan.source_id,
+            plan.positions,
+            quality=quality,
+        )
 
         return Playlist(
-            title=release.release.title_ru,
+            title=plan.title,
             videos=videos,
         )
 
@@ -154,59 +653,32 @@ class AnixartPlaylistExtractor:
         *,
         pages_max: int = 2,
     ) -> list[Type]:
-        # --- classic method ---
-        episode_types = self.client.get_episode_types(release_id)
-
-        if episode_types.code == 0:
-            return sorted(episode_types.types, key=lambda type: type.name)
-
-        # --- workaround (for releases banned in the region) ---
-        episode_updates: list[EpisodeUpdate] = []
-
-        for page in range(1, pages_max + 1):
-            _episode_updates = self.client.get_episode_updates(release_id, page=page)
-
-            self.assert_code(_episode_updates)
-            episode_updates += _episode_updates.content
-
-        types: list[Type] = []
-        for episode_update in episode_updates:
-            if not any(
-                map(
-                    lambda type: type.id == episode_update.last_episode_type_update_id,
-                    types,
-                )
-            ):
-                types.append(
-                    Type.model_validate(
-                        {
-                            "@id": 0,
-                            "id": episode_update.last_episode_type_update_id,
-                            "name": episode_update.lastEpisodeTypeUpdateName,
-                            "icon": None,
-                            "workers": None,
-                            "is_sub": False,
-                            "episodes_count": 0,
-                            "view_count": 0,
-                            "pinned": False,
-                        }
-                    )
-                )
-
-        return sorted(types, key=lambda type: type.name)
+        return list_release_types(
+            self.client,
+            release_id,
+            pages_max=pages_max,
+            max_workers=self.max_workers,
+        )
 
     def print_types(
         self,
         *,
         release_id: int | None = None,
         pages_max: int = 2,
+        search: str | None = None,
+        type_catalog_path: str | None = None,
     ) -> None:
         if release_id is not None:
             types = self.list_release_types(release_id, pages_max=pages_max)
+            if search is not None:
+                types = TypeCatalog(types).search(search, limit=None)
         else:
-            type_all = self.client.get_type_all()
-            self.assert_code(type_all)
-            types = type_all.types
+            type_catalog = load_type_catalog(self.client, path=type_catalog_path)
+            types = (
+                type_catalog.search(search)
+                if search is not None
+                else list(type_catalog.types.values())
+            )
 
         print("TypeID | Название озвучки")
         for type in types:
@@ -221,31 +693,518 @@ class AnixartPlaylistExtractor:
         extract_last: bool | None = None,
         quality: Quality = Quality.q720,
         output_dir: str = "output",
-    ) -> None:
-        playlist = self.get_playlist(
-            release_id=release_id,
-            type_id=type_id,
+        update: bool = False,
+        deadline: float | None = None,
+    ) -> str:
+        # NOTE: the deadline covers the whole extraction, planning included
+        expires_at = get_expires_at(deadline)
+
+        if update and (
+            manifest_path := find_playlist_manifest(
+                output_dir,
+                release_id,
+                type_id,
+                quality=quality,
+            )
+        ):
+            return self.update_playlist(
+                manifest_path,
+                extract_only=extract_only,
+                extract_last=extract_last,
+                expires_at=expires_at,
+            )
+
+        plan = self.plan_playlist(
+            release_id,
+            type_id,
             extract_only=extract_only,
             extract_last=extract_last,
+            expires_at=expires_at,
+        )
+
+        return self.save_playlist(
+            plan,
+            self.iter_playlist_videos(
+                plan.release_id,
+                plan.source_id,
+                plan.positions,
+                quality=quality,
+                expires_at=expires_at,
+            ),
             quality=quality,
+            output_dir=output_dir,
+        )
+
+    def extract_playlists(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        qualities: list[Quality] = list(Quality),
+        output_dir: str = "output",
+        update: bool = False,
+        deadline: float | None = None,
+    ) -> dict[Quality, str]:
+        expires_at = get_expires_at(deadline)
+        paths: dict[Quality, str] = {}
+
+        if update:
+            index = index_playlist_manifests(output_dir)
+            manifest_paths = {
+                quality: manifest_path
+                for quality in qualities
+                if (
+                    manifest_path := find_playlist_manifest(
+                        output_dir,
+                        release_id,
+                        type_id,
+                        quality=quality,
+                        index=index,
+                    )
+                )
+            }
+
+            # NOTE: episodes missing from any of the playlists are resolved once
+            if manifest_paths:
+                updated = self.update_playlists_videos(
+                    list(manifest_paths.values()),
+                    extract_only=extract_only,
+                    extract_last=extract_last,
+                    expires_at=expires_at,
+                )
+                paths |= {
+                    quality: path for quality, (path, _) in zip(manifest_paths, updated)
+                }
+
+        if qualities := [quality for quality in qualities if quality not in paths]:
+            plan = self.plan_playlist(
+                release_id,
+                type_id,
+                extract_only=extract_only,
+                extract_last=extract_last,
+                expires_at=expires_at,
+            )
+            paths |= self.save_playlists(
+                plan,
+                self.iter_playlist_video_qualities(
+                    plan.release_id,
+                    plan.source_id,
+                    plan.positions,
+                    qualities=qualities,
+                    expires_at=expires_at,
+                ),
+                qualities=qualities,
+                output_dir=output_dir,
+            )
+
+        return paths
+
+    def update_playlist(
+        self,
+        manifest_path: str,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        expires_at: float | None = None,
+    ) -> str:
+        path, _ = self.update_playlist_videos(
+            manifest_path,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            expires_at=expires_at,
+        )
+
+        return path
+
+    def update_playlist_videos(
+        self,
+        manifest_path: str,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        expires_at: float | None = None,
+    ) -> tuple[str, list[PlaylistVideo]]:
+        # NOTE: returns the playlist path and the newly resolved videos
+        return self.update_playlists_videos(
+            [manifest_path],
+            extract_only=extract_only,
+            extract_last=extract_last,
+            expires_at=expires_at,
+        )[0]
+
+    def update_playlists_videos(
+        self,
+        manifest_paths: list[str],
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        expires_at: float | None = None,
+    ) -> list[tuple[str, list[PlaylistVideo]]]:
+        manifests = [
+            read_playlist_manifest(manifest_path) for manifest_path in manifest_paths
+        ]
+        missing: list[list[int]] = [[] for _ in manifests]
+        resolved: dict[tuple[int, int], dict[Quality, PlaylistVideo]] = {}
+        deadline_errors: list[DeadlineExceededError] = []
+
+        # NOTE: playlists of one source (e.g. one per quality) share a single pass
+        # over the union of their missing episodes
+        sources: dict[tuple[int, int, int], list[int]] = {}
+        for index, manifest in enumerate(manifests):
+            sources.setdefault(
+                (manifest.release_id, manifest.type_id, manifest.source_id),
+                [],
+            ).append(index)
+
+        for (release_id, type_id, source_id), indexes in sources.items():
+            episodes = self.client.get_episodes(
+                release_id,
+                type_id,
+                source_id,
+                response_model=EpisodesSummaryResponse,
+                expires_at=expires_at,
+            )
+
+            self.assert_code(episodes)
+
+            selected = [
+                episode.position
+                for episode in select_episodes(
+                    episodes.episodes,
+                    extract_only=extract_only,
+                    extract_last=extract_last,
+                )
+            ]
+
+            for index in indexes:
+                known_positions = {video.id for video in manifests[index].videos}
+                missing[index] = [
+                    position for position in selected if position not in known_positions
+                ]
+
+            positions = sorted(
+                {position for index in indexes for position in missing[index]}
+            )
+            if not positions:
+                continue
+
+            for videos in stop_at_deadline(
+                self.iter_playlist_video_qualities(
+                    release_id,
+                    source_id,
+                    positions,
+                    qualities=list(
+                        dict.fromkeys(manifests[index].quality for index in indexes)
+                    ),
+                    expires_at=expires_at,
+                ),
+                deadline_errors,
+            ):
+                # NOTE: every quality of an episode carries the same position
+                resolved[source_id, next(iter(videos.values())).id] = videos
+
+        results: list[tuple[str, list[PlaylistVideo]]] = []
+
+        for manifest_path, manifest, manifest_missing in zip(
+            manifest_paths,
+            manifests,
+            missing,
+        ):
+            path = os.path.join(os.path.dirname(manifest_path), manifest.playlist)
+
+            if not manifest_missing and os.path.exists(path):
+                results.append((path, []))
+                continue
+
+            videos = [
+                resolved[manifest.source_id, position][manifest.quality]
+                for position in manifest_missing
+                if (manifest.source_id, position) in resolved
+            ]
+            manifest.videos = sorted(
+                [*manifest.videos, *videos],
+                key=lambda video: video.id,
+            )
+
+            vlc_playlist_builder.write_playlist(path, manifest.title, manifest.videos)
+            write_playlist_manifest(manifest_path, manifest)
+            results.append((path, videos))
+
+        # NOTE: the missing episodes are picked up by the next update
+        for exception in deadline_errors:
+            exception.paths = [path for path, _ in results]
+            raise exception
+
+        return results
+
+    def refresh_playlist(self, manifest_path: str) -> str:
+        manifest = read_playlist_manifest(manifest_path)
+        path = os.path.join(os.path.dirname(manifest_path), manifest.playlist)
+        videos = {video.id: video for video in manifest.videos}
+
+        # NOTE: only Kodik is asked for new links, Anixart is skipped for every video
+        # with a stored url (manifests written before urls were stored lack them)
+        def refresh(position: int) -> PlaylistVideo:
+            with measure_phase(self.hooks, "episode"):
+                video = videos[position]
+                url = (
+                    video.url
+                    if video.url is not None
+                    else self.get_episode_summary(
+                        manifest.release_id,
+                        manifest.source_id,
+                        position,
+                    ).url
+                )
+
+                return video.model_copy(
+                    update={
+                        "location": self.get_location(url, quality=manifest.quality),
+                        "url": url,
+                    }
+                )
+
+        manifest.videos = list(
+            self.iter_resolved(
+                manifest.release_id,
+                manifest.source_id,
+                list(videos),
+                refresh,
+            )
         )
 
+        vlc_playlist_builder.write_playlist(path, manifest.title, manifest.videos)
+        write_playlist_manifest(manifest_path, manifest)
+
+        return path
+
+    def export_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        playlist_format: str = "jsonl",
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        quality: Quality = Quality.q720,
+        output_dir: str = "-",
+        ordered: bool | None = None,
+        deadline: float | None = None,
+    ) -> str:
+        expires_at = get_expires_at(deadline)
+        plan = self.plan_playlist(
+            release_id,
+            type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            expires_at=expires_at,
+        )
+        deadline_errors: list[DeadlineExceededError] = []
+        videos = stop_at_deadline(
+            self.iter_playlist_videos(
+                plan.release_id,
+                plan.source_id,
+                plan.positions,
+                quality=quality,
+                # NOTE: jsonl records carry their position, so they need not wait in
+                # order
+                ordered=ordered if ordered is not None else playlist_format != "jsonl",
+                expires_at=expires_at,
+            ),
+            deadline_errors,
+        )
+
+        # NOTE: "-" streams to stdout; no manifest is written for exported playlists
+        if output_dir == "-":
+            path = output_dir
+            self.write_playlist_stream(plan, videos, sys.stdout, playlist_format)
+        else:
+            path = self.get_playlist_path(
+                plan.title,
+                output_dir=output_dir,
+                extension=playlist_format,
+            )
+            with atomic_write(path) as file:
+                self.write_playlist_stream(plan, videos, file, playlist_format)
+
+        for exception in deadline_errors:
+            exception.paths = [path]
+            raise exception
+
+        return path
+
+    def write_playlist_stream(
+        self,
+        plan: PlaylistPlan,
+        videos: Iterable[PlaylistVideo],
+        file: TextIO,
+        playlist_format: str = "xspf",
+    ) -> None:
+        with PLAYLIST_WRITERS[playlist_format](file, plan.title) as writer:
+            for video in videos:
+                writer.write_track(video)
+
+        file.flush()
+
+    def get_playlist_path(
+        self,
+        title: str,
+        *,
+        output_dir: str = "output",
+        quality: Quality | None = None,
+        extension: str = "xspf",
+    ) -> str:
         os.makedirs(output_dir, exist_ok=True)
-        path = os.path.join(output_dir, f"{self.clean_filename(playlist.title)}.xspf")
+        filename = self.clean_filename(title)
+        if quality is not None:
+            filename = f"{filename} [{quality}p]"
+        return os.path.join(output_dir, f"{filename}.{extension}")
+
+    def save_playlist(
+        self,
+        plan: PlaylistPlan,
+        videos: Iterable[PlaylistVideo],
+        *,
+        quality: Quality = Quality.q720,
+        output_dir: str = "output",
+    ) -> str:
+        paths = self.save_playlists(
+            plan,
+            ({quality: video} for video in videos),
+            qualities=[quality],
+            output_dir=output_dir,
+            quality_suffix=False,
+        )
 
-        with open(path, "w", encoding="utf-8") as file:
-            file.write(build_playlist(playlist))
+        return paths[quality]
+
+    def save_playlists(
+        self,
+        plan: PlaylistPlan,
+        videos: Iterable[dict[Quality, PlaylistVideo]],
+        *,
+        qualities: list[Quality],
+        output_dir: str = "output",
+        quality_suffix: bool = True,
+    ) -> dict[Quality, str]:
+        paths = {
+            quality: self.get_playlist_path(
+                plan.title,
+                output_dir=output_dir,
+                quality=quality if quality_suffix else None,
+            )
+            for quality in qualities
+        }
+        saved_videos: dict[Quality, list[PlaylistVideo]] = {
+            quality: [] for quality in qualities
+        }
+        render_time = 0.0
+        deadline_errors: list[DeadlineExceededError] = []
+
+        with ExitStack() as stack:
+            writers = {
+                quality: stack.enter_context(
+                    vlc_playlist_builder.XSPFWriter(
+                        stack.enter_context(atomic_write(path)),
+                        plan.title,
+                    )
+                )
+                for quality, path in paths.items()
+            }
+
+            # NOTE: every playlist is written as soon as the next episode is resolved
+            for resolved in stop_at_deadline(videos, deadline_errors):
+                started = time.perf_counter()
+                for quality, writer in writers.items():
+                    writer.write_track(resolved[quality])
+                    saved_videos[quality].append(resolved[quality])
+                render_time += time.perf_counter() - started
+
+        with measure_phase(self.hooks, "manifest"):
+            for quality, path in paths.items():
+                write_playlist_manifest(
+                    get_playlist_manifest_path(path),
+                    PlaylistManifest(
+                        release_id=plan.release_id,
+                        type_id=plan.type_id,
+                        source_id=plan.source_id,
+                        quality=quality,
+                        title=plan.title,
+                        playlist=os.path.basename(path),
+                        videos=saved_videos[quality],
+                    ),
+                )
+
+        if self.hooks:
+            emit(self.hooks, PhaseEvent(phase="render", wall_time=render_time))
+
+        # NOTE: partial playlists are saved with a manifest, so `--update` later
+        # resolves only the missing episodes
+        for exception in deadline_errors:
+            exception.paths = list(paths.values())
+            raise exception
+
+        return paths
 
 
 def print_types(
     *,
     release_id: int | None = None,
     pages_max: int = 2,
+    search: str | None = None,
+    max_workers: int = 4,
+    cache: ResponseCache | None = None,
+    profiler: Profiler | None = None,
 ) -> None:
-    with Client() as client:
-        AnixartPlaylistExtractor(client).print_types(
+    with Client(
+        cache=cache,
+        pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+        hooks=[profiler.on_request] if profiler is not None else None,
+    ) as client:
+        AnixartPlaylistExtractor(client, max_workers=max_workers).print_types(
             release_id=release_id,
             pages_max=pages_max,
+            search=search,
+            type_catalog_path=(
+                default_type_catalog_path() if cache is not None else None
+            ),
+        )
+
+
+@contextmanager
+def open_extractor(
+    *,
+    max_workers: int = 1,
+    cache: ResponseCache | None = None,
+    warm_up: bool = False,
+    profiler: Profiler | None = None,
+    source_probing: bool = False,
+    store: MetadataStore | None = None,
+) -> Iterator[AnixartPlaylistExtractor]:
+    # NOTE: chosen sources are remembered across runs only alongside the disk cache
+    source_choices = (
+        SourceChoiceStore(default_source_choices_path() if cache is not None else None)
+        if source_probing
+        else None
+    )
+
+    with Client(
+        cache=cache,
+        video_links_cache=VideoLinksCache(cache) if cache is not None else None,
+        pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+        hooks=[profiler.on_request] if profiler is not None else None,
+    ) as client:
+        if warm_up:
+            client.warm_up(connections=max_workers)
+
+        yield AnixartPlaylistExtractor(
+            client,
+            max_workers=max_workers,
+            hooks=[profiler.on_phase] if profiler is not None else None,
+            source_choices=source_choices,
+            store=store,
         )
 
 
@@ -257,20 +1216,136 @@ def extract_playlist(
     extract_last: bool | None = None,
     quality: Quality = Quality.q720,
     output_dir: str = "output",
-) -> None:
-    with Client() as client:
-        AnixartPlaylistExtractor(client).extract_playlist(
+    update: bool = False,
+    deadline: float | None = None,
+    max_workers: int = 1,
+    cache: ResponseCache | None = None,
+    warm_up: bool = False,
+    profiler: Profiler | None = None,
+    source_probing: bool = False,
+    store: MetadataStore | None = None,
+) -> str:
+    with open_extractor(
+        max_workers=max_workers,
+        cache=cache,
+        warm_up=warm_up,
+        profiler=profiler,
+        source_probing=source_probing,
+        store=store,
+    ) as extractor:
+        return extractor.extract_playlist(
+            release_id=release_id,
+            type_id=type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            quality=quality,
+            output_dir=output_dir,
+            update=update,
+            deadline=deadline,
+        )
+
+
+def extract_playlists(
+    release_id: int,
+    type_id: int,
+    *,
+    extract_only: list[int] | None = None,
+    extract_last: bool | None = None,
+    qualities: list[Quality] = list(Quality),
+    output_dir: str = "output",
+    update: bool = False,
+    deadline: float | None = None,
+    max_workers: int = 1,
+    cache: ResponseCache | None = None,
+    warm_up: bool = False,
+    profiler: Profiler | None = None,
+    source_probing: bool = False,
+    store: MetadataStore | None = None,
+) -> dict[Quality, str]:
+    with open_extractor(
+        max_workers=max_workers,
+        cache=cache,
+        warm_up=warm_up,
+        profiler=profiler,
+        source_probing=source_probing,
+        store=store,
+    ) as extractor:
+        return extractor.extract_playlists(
+            release_id=release_id,
+            type_id=type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            qualities=qualities,
+            output_dir=output_dir,
+            update=update,
+            deadline=deadline,
+        )
+
+
+def refresh_playlists(
+    manifest_paths: list[str],
+    *,
+    max_workers: int = 1,
+    cache: ResponseCache | None = None,
+    profiler: Profiler | None = None,
+) -> list[str]:
+    with open_extractor(
+        max_workers=max_workers,
+        cache=cache,
+        profiler=profiler,
+    ) as extractor:
+        return [
+            extractor.refresh_playlist(manifest_path)
+            for manifest_path in manifest_paths
+        ]
+
+
+def export_playlist(
+    release_id: int,
+    type_id: int,
+    *,
+    playlist_format: str = "jsonl",
+    extract_only: list[int] | None = None,
+    extract_last: bool | None = None,
+    quality: Quality = Quality.q720,
+    output_dir: str = "-",
+    ordered: bool | None = None,
+    deadline: float | None = None,
+    max_workers: int = 1,
+    cache: ResponseCache | None = None,
+    warm_up: bool = False,
+    profiler: Profiler | None = None,
+    source_probing: bool = False,
+    store: MetadataStore | None = None,
+) -> str:
+    with open_extractor(
+        max_workers=max_workers,
+        cache=cache,
+        warm_up=warm_up,
+        profiler=profiler,
+        source_probing=source_probing,
+        store=store,
+    ) as extractor:
+        return extractor.export_playlist(
             release_id=release_id,
             type_id=type_id,
+            playlist_format=playlist_format,
             extract_only=extract_only,
             extract_last=extract_last,
             quality=quality,
             output_dir=output_dir,
+            ordered=ordered,
+            deadline=deadline,
         )
 
 
 __all__ = (
+    PLAYLIST_WRITERS,
     AnixartPlaylistExtractor,
     print_types,
+    open_extractor,
     extract_playlist,
+    extract_playlists,
+    refresh_playlists,
+    export_playlist,
 )
@@ -0,0 +1,322 @@
+import asyncio
+import os
+
+from typing import AsyncIterator
+
+from anixart_playlist_extractor import vlc_playlist_builder
+from anixart_playlist_extractor.async_client import AsyncClient
+from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.exceptions import EpisodeResolutionError, NoSourcesError
+from anixart_playlist_extractor.models import (
+    EpisodeSummaryResponse,
+    EpisodesSummaryResponse,
+    Playlist,
+    PlaylistPlan,
+    PlaylistVideo,
+    ReleaseSummaryResponse,
+    Type,
+)
+from anixart_playlist_extractor.utils import (
+    assert_code,
+    clean_filename,
+    add_episode_update_types,
+    get_video_link,
+    parse_episode_url,
+    select_episodes,
+)
+
+
+class AsyncAnixartPlaylistExtractor:
+    def __init__(
+        self,
+        client: AsyncClient = None,
+        *,
+        max_concurrency: int = 16,
+    ) -> None:
+        self.client: AsyncClient = client if client is not None else AsyncClient()
+        self.max_concurrency: int = max_concurrency
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def get_location(
+        self,
+        url: str,
+        *,
+        quality: Quality = Quality.q720,
+    ) -> str:
+        video_links = await self.client.get_video_links(*parse_episode_url(url))
+
+        return get_video_link(video_links, quality=quality)
+
+    async def get_playlist_video(
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+        *,
+        quality: Quality = Quality.q720,
+    ) -> PlaylistVideo:
+        async with self.semaphore:
+            episode = await self.client.get_episode(
+                release_id,
+                source_id,
+                position,
+                response_model=EpisodeSummaryResponse,
+            )
+
+            assert_code(episode)
+
+            return PlaylistVideo(
+                id=episode.episode.position,
+                title=episode.episode.name,
+                location=await self.get_location(
+                    episode.episode.url,
+                    quality=quality,
+                ),
+                url=episode.episode.url,
+            )
+
+    async def iter_playlist_videos(
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        *,
+        quality: Quality = Quality.q720,
+        ordered: bool = True,
+    ) -> AsyncIterator[PlaylistVideo]:
+        tasks = {
+            asyncio.ensure_future(
+                self.get_playlist_video(
+                    release_id,
+                    source_id,
+                    position,
+                    quality=quality,
+                )
+            ): position
+            for position in positions
+        }
+        pending = set(tasks)
+        resolved: dict[int, PlaylistVideo] = {}
+        index = 0
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                # NOTE: fail on the first error regardless of its position
+                failed = sorted(
+                    (tasks[task], task) for task in done if task.exception() is not None
+                )
+                if failed:
+                    position, task = failed[0]
+                    raise EpisodeResolutionError(
+                        release_id=release_id,
+                        source_id=source_id,
+                        position=position,
+                        reason=task.exception(),
+                    ) from task.exception()
+
+                for task in sorted(done, key=tasks.get):
+                    if ordered:
+                        resolved[tasks[task]] = task.result()
+                    else:
+                        yield task.result()
+
+                # NOTE: ordered, yield as soon as the next position is resolved
+                while index < len(positions) and positions[index] in resolved:
+                    yield resolved.pop(positions[index])
+                    index += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def get_playlist_videos(
+        self,
+        release_id: int,
+        source_id: int,
+        positions: list[int],
+        *,
+        quality: Quality = Quality.q720,
+    ) -> list[PlaylistVideo]:
+        return [
+            video
+            async for video in self.iter_playlist_videos(
+                release_id,
+                source_id,
+                positions,
+                quality=quality,
+            )
+        ]
+
+    async def plan_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+    ) -> PlaylistPlan:
+        release, episode_sources = await asyncio.gather(
+            self.client.get_release(
+                release_id,
+                response_model=ReleaseSummaryResponse,
+            ),
+            self.client.get_episode_sources(release_id, type_id),
+        )
+
+        assert_code(release)
+        assert_code(episode_sources)
+
+        if len(episode_sources.sources) < 1:
+            raise NoSourcesError(release_id=release_id, type_id=type_id)
+
+        source_id = episode_sources.sources[0].id
+        episodes = await self.client.get_episodes(
+            release_id,
+            type_id,
+            source_id,
+            response_model=EpisodesSummaryResponse,
+        )
+
+        assert_code(episodes)
+
+        episodes = select_episodes(
+            episodes.episodes,
+            extract_only=extract_only,
+            extract_last=extract_last,
+        )
+
+        return PlaylistPlan(
+            release_id=release_id,
+            type_id=type_id,
+            source_id=source_id,
+            title=release.release.title_ru,
+            positions=[episode.position for episode in episodes],
+            titles={episode.position: episode.name for episode in episodes},
+        )
+
+    async def get_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        quality: Quality = Quality.q720,
+    ) -> Playlist:
+        plan = await self.plan_playlist(
+            release_id,
+            type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+        )
+
+        videos = await self.get_playlist_videos(
+            plan.release_id,
+            plan.source_id,
+            plan.positions,
+            quality=quality,
+        )
+
+        return Playlist(
+            title=plan.title,
+            videos=videos,
+        )
+
+    async def list_release_types(
+        self,
+        release_id: int,
+        *,
+        pages_max: int = 2,
+    ) -> list[Type]:
+        # --- classic method ---
+        episode_types = await self.client.get_episode_types(release_id)
+
+        if episode_types.code == 0:
+            return sorted(episode_types.types, key=lambda type: type.name)
+
+        # --- workaround (for releases banned in the region) ---
+        types: dict[int, Type] = {}
+        last_page = pages_max
+        first_page, pages_count = 1, 1
+
+        # NOTE: the first page alone tells `total_page_count`, the rest go in waves
+        while first_page <= last_page:
+            pages = range(first_page, min(first_page + pages_count, last_page + 1))
+            added = False
+
+            for episode_updates in await asyncio.gather(
+                *(
+                    self.client.get_episode_updates(release_id, page=page)
+                    for page in pages
+                )
+            ):
+                assert_code(episode_updates)
+                last_page = min(last_page, episode_updates.total_page_count)
+                if add_episode_update_types(types, episode_updates.content):
+                    added = True
+
+            # NOTE: stop early once a whole wave of pages brings no new types
+            if not added:
+                break
+
+            first_page, pages_count = pages.stop, self.max_concurrency
+
+        return sorted(types.values(), key=lambda type: type.name)
+
+    async def extract_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        extract_only: list[int] | None = None,
+        extract_last: bool | None = None,
+        quality: Quality = Quality.q720,
+        output_dir: str = "output",
+    ) -> None:
+        playlist = await self.get_playlist(
+            release_id=release_id,
+            type_id=type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            quality=quality,
+        )
+
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{clean_filename(playlist.title)}.xspf")
+
+        vlc_playlist_builder.write_playlist(path, playlist.title, playlist.videos)
+
+
+async def extract_playlist_async(
+    release_id: int,
+    type_id: int,
+    *,
+    extract_only: list[int] | None = None,
+    extract_last: bool | None = None,
+    quality: Quality = Quality.q720,
+    output_dir: str = "output",
+    max_concurrency: int = 16,
+) -> None:
+    async with AsyncClient(pool_size=max_concurrency) as client:
+        await AsyncAnixartPlaylistExtractor(
+            client,
+            max_concurrency=max_concurrency,
+        ).extract_playlist(
+            release_id=release_id,
+            type_id=type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+            quality=quality,
+            output_dir=output_dir,
+        )
+
+
+__all__ = (
+    AsyncAnixartPlaylistExtractor,
+    extract_playlist_async,
+)
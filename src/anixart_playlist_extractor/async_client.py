@@ -0,0 +1,480 @@
+import asyncio
+import time
+
+from typing import Mapping
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+try:
+    from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+except ImportError:  # NOTE: optional dependency (`pip install .[async]`)
+    ClientError = ClientSession = ClientTimeout = TCPConnector = None
+
+from anixart_playlist_extractor.cache import (
+    DEFAULT_TTLS,
+    ResponseCache,
+    build_cache_entry,
+    cache_key,
+    lookup_cache_entry,
+)
+from anixart_playlist_extractor.client import (
+    ANIXART_HEADERS,
+    DEFAULT_POOL_SIZE,
+    ANIXART_URL,
+    KODIK_HEADERS,
+    KODIK_UNKNOWN_PARAM,
+    KODIK_URL,
+    emit_request_error,
+    parse_response,
+)
+from anixart_playlist_extractor.exceptions import RequestDeadlineError, RequestError
+from anixart_playlist_extractor.host_policy import HostPolicy
+from anixart_playlist_extractor.models import (
+    AnixartResponse,
+    EpisodeResponse,
+    EpisodeSourcesResponse,
+    EpisodeTypesResponse,
+    EpisodeUpdatesResponse,
+    EpisodesResponse,
+    ReleaseResponse,
+    TypeAllResponse,
+    VideoLinksResponse,
+)
+from anixart_playlist_extractor.profiling import RequestEvent, RequestHook, emit
+from anixart_playlist_extractor.single_flight import AsyncSingleFlight
+from anixart_playlist_extractor.utils import get_remaining
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+
+class AsyncClient:
+    def __init__(
+        self,
+        session: "ClientSession" = None,
+        *,
+        cache: ResponseCache | None = None,
+        ttls: dict[str, float] | None = None,
+        video_links_cache: VideoLinksCache | None = None,
+        policies: dict[str, HostPolicy] | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        hooks: list[RequestHook] | None = None,
+        anixart_host: str = ANIXART_URL,
+        kodik_host: str = KODIK_URL,
+        scheme: str = "https",
+        kodik_scheme: str = "http",
+        coalesce: bool = True,
+    ) -> None:
+        if ClientSession is None:
+            raise ImportError(
+                "AsyncClient requires aiohttp "
+                "(install with `pip install anixart_playlist_extractor[async]`)"
+            )
+
+        self.session: ClientSession | None = session
+        self.pool_size: int = pool_size
+        self.hooks: list[RequestHook] = list(hooks or [])
+        self.anixart_host: str = anixart_host
+        self.kodik_host: str = kodik_host
+        self.scheme: str = scheme
+        # NOTE: the Kodik API has always been requested over plain HTTP
+        self.kodik_scheme: str = kodik_scheme
+        self.cache: ResponseCache | None = cache
+        self.ttls: dict[str, float] = DEFAULT_TTLS if ttls is None else ttls
+        self.video_links_cache: VideoLinksCache | None = video_links_cache
+        self.policies: dict[str, HostPolicy] = dict(policies or {})
+        # NOTE: identical requests in flight at the same time share one response
+        self.single_flight: AsyncSingleFlight | None = (
+            AsyncSingleFlight() if coalesce else None
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, exception_traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.video_links_cache is not None:
+            self.video_links_cache.close()
+
+    def get_session(self) -> "ClientSession":
+        # NOTE: aiohttp sessions must be created inside a running event loop
+        if self.session is None:
+            self.session = ClientSession(
+                connector=TCPConnector(limit_per_host=self.pool_size),
+            )
+        return self.session
+
+    def get_anixart_url(self, path: str, *, host: str | None = None) -> str:
+        return f"{self.scheme}://{host or self.anixart_host}{path}"
+
+    def get_kodik_url(self, path: str, *, host: str | None = None) -> str:
+        return f"{self.kodik_scheme}://{host or self.kodik_host}{path}"
+
+    def get_host_policy(self, host: str) -> HostPolicy:
+        if host not in self.policies:
+            self.policies[host] = HostPolicy()
+        return self.policies[host]
+
+    async def send(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] = None,
+        params: dict[str, str] = None,
+        expires_at: float | None = None,
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        host = urlparse(url).netloc
+        policy = self.get_host_policy(host)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            await asyncio.sleep(
+                policy.before_attempt(url=url, host=host, expires_at=expires_at)
+            )
+            connect_timeout, read_timeout = policy.get_timeouts(
+                url=url,
+                expires_at=expires_at,
+            )
+
+            try:
+                async with self.get_session().get(
+                    url,
+                    headers=headers,
+                    params=(
+                        {name: str(value) for name, value in params.items()}
+                        if params is not None
+                        else None
+                    ),
+                    timeout=ClientTimeout(
+                        total=get_remaining(expires_at),
+                        sock_connect=connect_timeout,
+                        sock_read=read_timeout,
+                    ),
+                ) as resp:
+                    status, resp_headers = resp.status, resp.headers
+                    content = await resp.read()
+            except (ClientError, asyncio.TimeoutError) as exception:
+                await asyncio.sleep(
+                    policy.on_error(
+                        attempt, url=url, exception=exception, expires_at=expires_at
+                    )
+                )
+                continue
+
+            delay = policy.on_response(
+                attempt,
+                url=url,
+                status=status,
+                retry_after=resp_headers.get("Retry-After"),
+                expires_at=expires_at,
+            )
+            if delay is None:
+                return status, resp_headers, content
+
+            await asyncio.sleep(delay)
+
+    async def request[ResponseModel: BaseModel](
+        self,
+        url: str,
+        response_model: ResponseModel,
+        *,
+        endpoint: str | None = None,
+        headers: dict[str, str] = None,
+        params: dict[str, str] = None,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        if self.single_flight is None:
+            return await self.fetch(
+                url,
+                response_model,
+                endpoint=endpoint,
+                headers=headers,
+                params=params,
+                expires_at=expires_at,
+            )
+
+        started = time.perf_counter()
+        # NOTE: waiters get the very same model instance as the caller that sent it
+        while True:
+            try:
+                response, shared = await self.single_flight.do(
+                    (cache_key(url, params), response_model),
+                    lambda: self.fetch(
+                        url,
+                        response_model,
+                        endpoint=endpoint,
+                        headers=headers,
+                        params=params,
+                        expires_at=expires_at,
+                    ),
+                )
+                break
+            except RequestDeadlineError as exception:
+                # NOTE: a waiter is not bound by the deadline of the caller it waited
+                # for, it sends the request again on its own
+                if exception.expires_at == expires_at:
+                    raise
+
+        if shared and self.hooks:
+            emit(
+                self.hooks,
+                RequestEvent(
+                    endpoint=endpoint,
+                    url=url,
+                    wall_time=time.perf_counter() - started,
+                    coalesced=True,
+                ),
+            )
+
+        return response
+
+    async def fetch[ResponseModel: BaseModel](
+        self,
+        url: str,
+        response_model: ResponseModel,
+        *,
+        endpoint: str | None = None,
+        headers: dict[str, str] = None,
+        params: dict[str, str] = None,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        key = cache_key(url, params)
+        ttl, entry = lookup_cache_entry(
+            self.cache,
+            self.ttls,
+            endpoint=endpoint,
+            key=key,
+        )
+        event = RequestEvent(endpoint=endpoint, url=url) if self.hooks else None
+
+        if entry is not None:
+            if entry.is_fresh():
+                if event is not None:
+                    event.cached = True
+                return parse_response(
+                    url,
+                    response_model,
+                    entry.content,
+                    event=event,
+                    hooks=self.hooks,
+                )
+            headers = {**(headers or {}), **entry.conditional_headers()}
+
+        started = time.perf_counter()
+        try:
+            status, resp_headers, resp_content = await self.send(
+                url,
+                headers=headers,
+                params=params,
+                expires_at=expires_at,
+            )
+        except RequestError as exception:
+            emit_request_error(self.hooks, event, exception, started=started)
+            raise
+
+        content = entry.content if status == 304 and entry is not None else resp_content
+
+        if event is not None:
+            event.status = status
+            event.wall_time = time.perf_counter() - started
+            event.bytes_received = len(resp_content)
+
+        response = parse_response(
+            url,
+            response_model,
+            content,
+            event=event,
+            hooks=self.hooks,
+        )
+
+        if ttl > 0:
+            self.cache.set(
+                key,
+                build_cache_entry(
+                    content,
+                    ttl=ttl,
+                    headers=resp_headers,
+                    previous=entry,
+                ),
+            )
+
+        return response
+
+    async def get_release[ResponseModel: AnixartResponse](
+        self,
+        release_id: int,
+        *,
+        response_model: ResponseModel = ReleaseResponse,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        return await self.request(
+            self.get_anixart_url(f"/release/{release_id}", host=host),
+            response_model,
+            endpoint="release",
+            headers=headers,
+            params={
+                "extended_mode": True,
+            },
+            expires_at=expires_at,
+        )
+
+    async def get_episode_types(
+        self,
+        release_id: int,
+        *,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> EpisodeTypesResponse:
+        return await self.request(
+            self.get_anixart_url(f"/episode/{release_id}", host=host),
+            EpisodeTypesResponse,
+            endpoint="episode_types",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_episode_sources(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> EpisodeSourcesResponse:
+        return await self.request(
+            self.get_anixart_url(f"/episode/{release_id}/{type_id}", host=host),
+            EpisodeSourcesResponse,
+            endpoint="episode_sources",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_episodes[ResponseModel: AnixartResponse](
+        self,
+        release_id: int,
+        type_id: int,
+        source_id: int,
+        *,
+        response_model: ResponseModel = EpisodesResponse,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        return await self.request(
+            self.get_anixart_url(
+                f"/episode/{release_id}/{type_id}/{source_id}",
+                host=host,
+            ),
+            response_model,
+            endpoint="episodes",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_episode[ResponseModel: AnixartResponse](
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+        *,
+        response_model: ResponseModel = EpisodeResponse,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        return await self.request(
+            self.get_anixart_url(
+                f"/episode/target/{release_id}/{source_id}/{position}",
+                host=host,
+            ),
+            response_model,
+            endpoint="episode",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_episode_updates(
+        self,
+        release_id: int,
+        *,
+        page: int = 0,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> EpisodeUpdatesResponse:
+        return await self.request(
+            self.get_anixart_url(f"/episode/updates/{release_id}/{page}", host=host),
+            EpisodeUpdatesResponse,
+            endpoint="episode_updates",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_type_all(
+        self,
+        *,
+        host: str | None = None,
+        headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
+    ) -> TypeAllResponse:
+        return await self.request(
+            self.get_anixart_url("/type/all", host=host),
+            TypeAllResponse,
+            endpoint="type_all",
+            headers=headers,
+            expires_at=expires_at,
+        )
+
+    async def get_video_links(
+        self,
+        link: str,
+        d: str,
+        s: str,
+        ip: str,
+        *,
+        p: str = KODIK_UNKNOWN_PARAM,
+        host: str | None = None,
+        headers: dict[str, str] = KODIK_HEADERS,
+        expires_at: float | None = None,
+        use_cache: bool = True,
+    ) -> VideoLinksResponse:
+        # NOTE: without `use_cache` Kodik is always asked, the links are still cached
+        if (
+            use_cache
+            and self.video_links_cache is not None
+            and (video_links := self.video_links_cache.get(link, d, s, ip))
+        ):
+            return video_links
+
+        video_links = await self.request(
+            self.get_kodik_url("/api/video-links", host=host),
+            VideoLinksResponse,
+            endpoint="video_links",
+            headers=headers,
+            params={
+                "p": p,
+                "link": link,
+                "d": d,
+                "s": s,
+                "ip": ip,
+            },
+            expires_at=expires_at,
+        )
+
+        if self.video_links_cache is not None:
+            self.video_links_cache.set(link, d, s, ip, video_links)
+
+        return video_links
+
+
+__all__ = (AsyncClient,)
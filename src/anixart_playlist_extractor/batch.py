@@ -0,0 +1,229 @@
+import csv
+import json
+import os
+import re
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel, field_validator
+
+try:
+    import yaml
+except ImportError:  # NOTE: optional dependency (`pip install .[yaml]`)
+    yaml = None
+
+from anixart_playlist_extractor.anixart_playlist_extractor import (
+    AnixartPlaylistExtractor,
+)
+from anixart_playlist_extractor.cache import ResponseCache
+from anixart_playlist_extractor.client import DEFAULT_POOL_SIZE, Client
+from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.exceptions import DeadlineExceededError, ManifestError
+from anixart_playlist_extractor.utils import get_expires_at
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+
+class BatchJob(BaseModel):
+    release_id: int
+    type_id: int
+    quality: Quality = Quality.q720
+    extract_only: list[int] | None = None
+    extract_last: bool | None = None
+    output_dir: str | None = None
+    deadline: float | None = None  # NOTE: seconds, the playlist is saved partially
+
+    @field_validator("extract_only", mode="before")
+    @classmethod
+    def split_extract_only(cls, value):
+        # NOTE: csv/yaml manifests may provide positions as "1,2,3" or "1 2 3"
+        if isinstance(value, str):
+            return [position for position in re.split(r"[\s,;]+", value) if position]
+        return value
+
+
+class BatchJobResult(BaseModel):
+    job: BatchJob
+    path: str | None = None
+    episodes: int = 0
+    missing: list[int] = []
+    error: str | None = None
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchReport(BaseModel):
+    results: list[BatchJobResult]
+    elapsed: float
+
+    @property
+    def succeeded(self) -> list[BatchJobResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[BatchJobResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def episodes(self) -> int:
+        return sum(result.episodes for result in self.results)
+
+    @property
+    def jobs_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def episodes_per_second(self) -> float:
+        return self.episodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def load_manifest(path: str) -> list[BatchJob]:
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        match extension:
+            case ".csv":
+                records = [
+                    {
+                        key: value
+                        for key, value in row.items()
+                        if value not in (None, "")
+                    }
+                    for row in csv.DictReader(file)
+                ]
+            case ".json":
+                records = json.load(file)
+            case ".yaml" | ".yml":
+                if yaml is None:
+                    raise ImportError(
+                        "YAML manifests require PyYAML "
+                        "(install with `pip install anixart_playlist_extractor[yaml]`)"
+                    )
+                records = yaml.safe_load(file)
+            case _:
+                raise ManifestError(f"Unsupported manifest format: {path}")
+
+    if isinstance(records, dict):
+        records = records.get("jobs", [])
+
+    return [BatchJob.model_validate(record) for record in records]
+
+
+def run_batch_job(
+    extractor: AnixartPlaylistExtractor,
+    job: BatchJob,
+    *,
+    output_dir: str = "output",
+) -> BatchJobResult:
+    start = time.perf_counter()
+    expires_at = get_expires_at(job.deadline)
+
+    try:
+        plan = extractor.plan_playlist(
+            job.release_id,
+            job.type_id,
+            extract_only=job.extract_only,
+            extract_last=job.extract_last,
+            expires_at=expires_at,
+        )
+        path = extractor.save_playlist(
+            plan,
+            extractor.iter_playlist_videos(
+                plan.release_id,
+                plan.source_id,
+                plan.positions,
+                quality=job.quality,
+                expires_at=expires_at,
+            ),
+            quality=job.quality,
+            output_dir=job.output_dir if job.output_dir is not None else output_dir,
+        )
+    except DeadlineExceededError as exception:
+        # NOTE: still a failure (so the queue retries it), but with a playlist
+        return BatchJobResult(
+            job=job,
+            path=exception.paths[0] if exception.paths else None,
+            episodes=len(plan.positions) - len(exception.missing),
+            missing=exception.missing,
+            error=str(exception),
+            elapsed=time.perf_counter() - start,
+        )
+    except Exception as exception:
+        return BatchJobResult(
+            job=job,
+            error=str(exception),
+            elapsed=time.perf_counter() - start,
+        )
+
+    return BatchJobResult(
+        job=job,
+        path=path,
+        episodes=len(plan.positions),
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def extract_batch(
+    jobs: list[BatchJob],
+    *,
+    output_dir: str = "output",
+    max_workers: int = 4,
+    client: Client | None = None,
+) -> BatchReport:
+    # NOTE: jobs share one client (one connection pool per host) and one worker pool;
+    # episodes of a single job are resolved sequentially inside its worker
+    extractor = AnixartPlaylistExtractor(client)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                lambda job: run_batch_job(extractor, job, output_dir=output_dir),
+                jobs,
+            )
+        )
+
+    return BatchReport(
+        results=results,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def extract_manifest(
+    manifest_path: str,
+    *,
+    output_dir: str = "output",
+    max_workers: int = 4,
+    cache: ResponseCache | None = None,
+    warm_up: bool = False,
+) -> BatchReport:
+    jobs = load_manifest(manifest_path)
+
+    with Client(
+        cache=cache,
+        video_links_cache=VideoLinksCache(cache) if cache is not None else None,
+        pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+    ) as client:
+        if warm_up:
+            client.warm_up(connections=max_workers)
+
+        return extract_batch(
+            jobs,
+            output_dir=output_dir,
+            max_workers=max_workers,
+            client=client,
+        )
+
+
+__all__ = (
+    BatchJob,
+    BatchJobResult,
+    BatchReport,
+    load_manifest,
+    run_batch_job,
+    extract_batch,
+    extract_manifest,
+)
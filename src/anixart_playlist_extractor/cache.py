@@ -0,0 +1,292 @@
+import os
+import sqlite3
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Mapping
+from urllib.parse import urlencode
+
+from pydantic import BaseModel
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# NOTE: keys are `endpoint` names passed to `Client.request`; missing or 0 -> not cached
+DEFAULT_TTLS: dict[str, float] = {
+    "type_all": 3 * DAY,
+    "release": 6 * HOUR,
+    "episode_types": HOUR,
+    "episode_sources": HOUR,
+    "episodes": 10 * MINUTE,
+    "episode": 10 * MINUTE,
+    "episode_updates": 10 * MINUTE,
+}
+
+
+class CacheEntry(BaseModel):
+    content: bytes
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class MemoryCache(ResponseCache):
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.lock: threading.Lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+class SQLiteCache(ResponseCache):
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        max_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.path: str = (
+            path
+            if path is not None
+            else os.path.join(default_cache_dir(), "responses.sqlite3")
+        )
+        self.max_size: int = max_size
+        self.lock: threading.Lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            """
+        )
+        # NOTE: running total of the stored content, so `set` does not scan the table
+        self.size: int = self.get_size()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT content, expires_at, etag, last_modified "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        content, expires_at, etag, last_modified = row
+        return CacheEntry(
+            content=content,
+            expires_at=expires_at,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def get_size(self) -> int:
+        (size,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return size
+
+    def get_entry_size(self, key: str) -> int:
+        row = self.connection.execute(
+            "SELECT size FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self.lock:
+            self.size -= self.get_entry_size(key)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, content, size, expires_at, etag, last_modified, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.content,
+                    len(entry.content),
+                    entry.expires_at,
+                    entry.etag,
+                    entry.last_modified,
+                    time.time(),
+                ),
+            )
+            self.size += len(entry.content)
+
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self) -> None:
+        # NOTE: other processes may write to the same file, so the total is recounted
+        # once the running one crosses the bound
+        size = self.size = self.get_size()
+
+        if size <= self.max_size:
+            return
+
+        # NOTE: least recently used first
+        rows = self.connection.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall()
+        keys: list[tuple[str]] = []
+        for key, entry_size in rows:
+            if size <= self.max_size:
+                break
+            keys.append((key,))
+            size -= entry_size
+
+        self.connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self.size = size
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.size -= self.get_entry_size(key)
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM entries")
+            self.size = 0
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+def default_cache_dir() -> str:
+    base_dir = (
+        os.environ.get("LOCALAPPDATA")
+        if os.name == "nt"
+        else os.environ.get("XDG_CACHE_HOME")
+    ) or os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(base_dir, "anixart_playlist_extractor")
+
+
+def lookup_cache_entry(
+    cache: ResponseCache | None,
+    ttls: dict[str, float],
+    *,
+    endpoint: str | None,
+    key: str,
+) -> tuple[float, CacheEntry | None]:
+    # NOTE: a ttl of 0 means the endpoint is neither read from nor written to the cache
+    ttl = ttls.get(endpoint, 0) if cache is not None else 0
+    return ttl, cache.get(key) if ttl > 0 else None
+
+
+def build_cache_entry(
+    content: bytes,
+    *,
+    ttl: float,
+    headers: Mapping[str, str],
+    previous: CacheEntry | None = None,
+) -> CacheEntry:
+    # NOTE: a 304 keeps the validators of the entry it revalidated
+    return CacheEntry(
+        content=content,
+        expires_at=time.time() + ttl,
+        etag=headers.get("ETag", previous and previous.etag),
+        last_modified=headers.get(
+            "Last-Modified",
+            previous and previous.last_modified,
+        ),
+    )
+
+
+def cache_key(
+    url: str,
+    params: dict[str, str] | None = None,
+) -> str:
+    if not params:
+        return url
+    query = urlencode(sorted((key, str(value)) for key, value in params.items()))
+    return f"{url}?{query}"
+
+
+__all__ = (
+    DEFAULT_TTLS,
+    CacheEntry,
+    ResponseCache,
+    MemoryCache,
+    SQLiteCache,
+    default_cache_dir,
+    lookup_cache_entry,
+    build_cache_entry,
+    cache_key,
+)
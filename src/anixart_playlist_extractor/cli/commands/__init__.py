@@ -1,9 +1,25 @@
+from anixart_playlist_extractor.cli.commands.enqueue import command_enqueue
 from anixart_playlist_extractor.cli.commands.extract import command_extract
+from anixart_playlist_extractor.cli.commands.extract_batch import (
+    command_extract_batch,
+)
 from anixart_playlist_extractor.cli.commands.list_types import command_list_types
+from anixart_playlist_extractor.cli.commands.refresh import command_refresh
+from anixart_playlist_extractor.cli.commands.serve import command_serve
+from anixart_playlist_extractor.cli.commands.sync import command_sync
+from anixart_playlist_extractor.cli.commands.watch import command_watch
+from anixart_playlist_extractor.cli.commands.worker import command_worker
 
 COMMANDS = (
+    command_enqueue,
     command_extract,
+    command_extract_batch,
     command_list_types,
+    command_refresh,
+    command_serve,
+    command_sync,
+    command_watch,
+    command_worker,
 )
 
 __all__ = (COMMANDS,)
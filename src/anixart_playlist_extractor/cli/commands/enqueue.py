@@ -0,0 +1,54 @@
+from pathlib import Path
+import click
+
+
+@click.command(
+    "enqueue",
+    help="Add jobs from a manifest to a work queue processed by `axapex worker`",
+)
+@click.option(
+    "-m",
+    "--manifest",
+    required=True,
+    help="Manifest with release_id, type_id, quality, extract_only, extract_last "
+    "and output_dir per job",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-Q",
+    "--queue",
+    required=True,
+    help="Work queue shared by the workers: a path to an SQLite file or "
+    "`<backend>://...`",
+)
+@click.option(
+    "-r",
+    "--requeue",
+    show_default=True,
+    default=False,
+    help="Run again jobs that are already done or failed",
+    is_flag=True,
+)
+def command_enqueue(
+    manifest: Path,
+    queue: str,
+    requeue: bool,
+):
+    from anixart_playlist_extractor.batch import load_manifest
+    from anixart_playlist_extractor.work_queue import open_work_queue
+
+    jobs = load_manifest(str(manifest))
+
+    try:
+        work_queue = open_work_queue(queue)
+    except ValueError as exception:
+        raise click.BadParameter(str(exception), param_hint="--queue")
+
+    with work_queue:
+        added = work_queue.enqueue(jobs, requeue=requeue)
+        counts = work_queue.counts()
+
+    click.echo(
+        f"{added} of {len(jobs)} jobs queued; "
+        + ", ".join(f"{count} {status}" for status, count in counts.items())
+    )
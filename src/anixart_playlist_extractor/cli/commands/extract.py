@@ -1,7 +1,7 @@
 from pathlib import Path
 import click
 
-from anixart_playlist_extractor import Quality, extract_playlist
+from anixart_playlist_extractor import Quality
 from anixart_playlist_extractor.cli.options import ListOption
 
 
@@ -43,34 +43,180 @@ from anixart_playlist_extractor.cli.options import ListOption
     "-q",
     "--quality",
     show_default=True,
-    default=Quality.q720.value,
-    help="Video quality",
+    default=[Quality.q720.value],
+    help="Video quality (repeat or use 'all' to save a playlist per quality)",
     type=click.Choice(
-        [quality.value for quality in Quality],
+        [quality.value for quality in Quality] + ["all"],
         case_sensitive=False,
     ),
+    multiple=True,
 )
 @click.option(
     "-o",
     "--output-dir",
     show_default=True,
     default="output",
-    help="Directory to save the output playlist",
-    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory to save the output playlist ('-' to stream it to stdout)",
+    type=click.Path(file_okay=False, allow_dash=True, path_type=Path),
+)
+@click.option(
+    "-f",
+    "--format",
+    "playlist_format",
+    show_default=True,
+    default="xspf",
+    help="Playlist format (jsonl records are written as soon as episodes resolve)",
+    type=click.Choice(["xspf", "m3u", "jsonl"], case_sensitive=False),
+)
+@click.option(
+    "-u",
+    "--update",
+    show_default=True,
+    default=False,
+    help="Resolve only episodes missing from a playlist previously saved to the "
+    "output dir",
+    is_flag=True,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=1,
+    help="Number of episodes to resolve concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--deadline",
+    default=None,
+    help="Seconds to extract within; the playlist is saved with the episodes resolved",
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+@click.option(
+    "--warm-up",
+    show_default=True,
+    default=False,
+    help="Open connections to Anixart and Kodik before extracting",
+    is_flag=True,
+)
+@click.option(
+    "--probe-sources",
+    show_default=True,
+    default=False,
+    help="Pick the fastest complete source of the type instead of the first one",
+    is_flag=True,
+)
+@click.option(
+    "--from-store",
+    show_default=True,
+    default=False,
+    help="Plan from the local metadata store (see `sync`), resolve only Kodik links",
+    is_flag=True,
+)
+@click.option(
+    "--profile",
+    default=None,
+    help="Write a JSON timing report per endpoint and phase (to stderr if no file)",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    is_flag=False,
+    flag_value="-",
 )
 def command_extract(
     release_id: int,
     type_id: int,
     extract_only: list[int] | None,
     extract_last: bool | None,
-    quality: Quality,
+    quality: tuple[str, ...],
     output_dir: Path,
+    playlist_format: str,
+    update: bool,
+    jobs: int,
+    deadline: float | None,
+    cache: bool,
+    warm_up: bool,
+    probe_sources: bool,
+    from_store: bool,
+    profile: str | None,
 ):
-    extract_playlist(
-        release_id,
-        type_id,
+    # NOTE: imported here to keep `axapex --help` fast
+    from anixart_playlist_extractor import (
+        export_playlist,
+        extract_playlist,
+        extract_playlists,
+    )
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.exceptions import DeadlineExceededError
+    from anixart_playlist_extractor.metadata_store import MetadataStore
+    from anixart_playlist_extractor.profiling import Profiler
+
+    qualities = (
+        list(Quality)
+        if "all" in quality
+        else [Quality(value) for value in dict.fromkeys(quality)]
+    )
+    # NOTE: manifests (and so updates and quality sets) exist only for xspf files
+    export = playlist_format != "xspf" or str(output_dir) == "-"
+    if export and (update or len(qualities) > 1):
+        raise click.UsageError(
+            "--update and several qualities need the xspf format and an output dir"
+        )
+
+    profiler = Profiler() if profile is not None else None
+    store = MetadataStore() if from_store else None
+    options = dict(
         extract_only=extract_only,
         extract_last=extract_last,
-        quality=Quality(quality),
         output_dir=str(output_dir),
+        deadline=deadline,
+        max_workers=jobs,
+        cache=SQLiteCache() if cache else None,
+        warm_up=warm_up,
+        profiler=profiler,
+        source_probing=probe_sources,
+        store=store,
     )
+
+    try:
+        if export:
+            export_playlist(
+                release_id,
+                type_id,
+                playlist_format=playlist_format,
+                quality=qualities[0],
+                **options,
+            )
+        # NOTE: several qualities share a single pass over Kodik
+        elif len(qualities) > 1:
+            extract_playlists(
+                release_id,
+                type_id,
+                qualities=qualities,
+                update=update,
+                **options,
+            )
+        else:
+            extract_playlist(
+                release_id,
+                type_id,
+                quality=qualities[0],
+                update=update,
+                **options,
+            )
+    except DeadlineExceededError as exception:
+        for path in exception.paths:
+            click.echo(f"PARTIAL {path}", err=True)
+        click.echo(
+            f"Missing positions: {', '.join(map(str, exception.missing))}",
+            err=True,
+        )
+        raise SystemExit(1)
+    finally:
+        if store is not None:
+            store.close()
+        if profiler is not None:
+            profiler.write_report(profile)
@@ -0,0 +1,79 @@
+from pathlib import Path
+import click
+
+
+@click.command(
+    "extract-batch",
+    help="Extract many playlists listed in a manifest (.csv, .json or .yaml)",
+)
+@click.option(
+    "-m",
+    "--manifest",
+    required=True,
+    help="Manifest with release_id, type_id, quality, extract_only, extract_last "
+    "and output_dir per job",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    show_default=True,
+    default="output",
+    help="Directory to save playlists of jobs without output_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=4,
+    help="Number of jobs to run concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+@click.option(
+    "--warm-up",
+    show_default=True,
+    default=False,
+    help="Open connections to Anixart and Kodik before extracting",
+    is_flag=True,
+)
+def command_extract_batch(
+    manifest: Path,
+    output_dir: Path,
+    jobs: int,
+    cache: bool,
+    warm_up: bool,
+):
+    from anixart_playlist_extractor.batch import extract_manifest
+    from anixart_playlist_extractor.cache import SQLiteCache
+
+    report = extract_manifest(
+        str(manifest),
+        output_dir=str(output_dir),
+        max_workers=jobs,
+        cache=SQLiteCache() if cache else None,
+        warm_up=warm_up,
+    )
+
+    for result in report.results:
+        job = f"{result.job.release_id}/{result.job.type_id} ({result.job.quality}p)"
+        if result.ok:
+            click.echo(f"OK   {job} -> {result.path} [{result.elapsed:.2f}s]")
+        else:
+            click.echo(f"FAIL {job}: {result.error} [{result.elapsed:.2f}s]", err=True)
+
+    click.echo(
+        f"{len(report.succeeded)} succeeded, {len(report.failed)} failed "
+        f"in {report.elapsed:.2f}s "
+        f"({report.jobs_per_second:.2f} jobs/s, "
+        f"{report.episodes_per_second:.2f} episodes/s)"
+    )
+
+    if report.failed:
+        raise SystemExit(1)
@@ -1,7 +1,5 @@
 import click
 
-from anixart_playlist_extractor import print_types
-
 
 @click.command(
     "list-types",
@@ -22,11 +20,58 @@ from anixart_playlist_extractor import print_types
     help="Max pages (used for a workaround to get release types)",
     type=click.INT,
 )
+@click.option(
+    "-s",
+    "--search",
+    default=None,
+    help="Show only types matching the name (prefix or fuzzy match)",
+    type=click.STRING,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=4,
+    help="Number of pages to fetch concurrently (used for a workaround)",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+@click.option(
+    "--profile",
+    default=None,
+    help="Write a JSON timing report per endpoint and phase (to stderr if no file)",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    is_flag=False,
+    flag_value="-",
+)
 def command_list_types(
     release_id: int | None = None,
     pages_max: int = 2,
+    search: str | None = None,
+    jobs: int = 4,
+    cache: bool = True,
+    profile: str | None = None,
 ):
-    print_types(
-        release_id=release_id,
-        pages_max=pages_max,
-    )
+    from anixart_playlist_extractor import print_types
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.profiling import Profiler
+
+    profiler = Profiler() if profile is not None else None
+
+    try:
+        print_types(
+            release_id=release_id,
+            pages_max=pages_max,
+            search=search,
+            max_workers=jobs,
+            cache=SQLiteCache() if cache else None,
+            profiler=profiler,
+        )
+    finally:
+        if profiler is not None:
+            profiler.write_report(profile)
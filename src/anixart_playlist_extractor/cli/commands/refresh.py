@@ -0,0 +1,68 @@
+from pathlib import Path
+import click
+
+
+@click.command(
+    "refresh",
+    help="Re-resolve expired Kodik links of saved playlists without Anixart requests",
+)
+@click.argument(
+    "paths",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=1,
+    help="Number of episodes to resolve concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=True,
+    help="Reuse Kodik links on disk while they are still valid",
+)
+def command_refresh(
+    paths: tuple[Path, ...],
+    jobs: int,
+    cache: bool,
+):
+    from anixart_playlist_extractor.anixart_playlist_extractor import open_extractor
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.exceptions import AnixartPlaylistExtractorError
+    from anixart_playlist_extractor.playlist_manifest import (
+        PLAYLIST_MANIFEST_SUFFIX,
+        get_playlist_manifest_path,
+        list_playlist_manifests,
+    )
+
+    # NOTE: a directory refreshes every playlist saved to it, a playlist or its
+    # manifest refreshes just that one
+    manifest_paths: list[str] = []
+    for path in paths:
+        if path.is_dir():
+            manifest_paths += list_playlist_manifests(str(path))
+        elif path.name.endswith(PLAYLIST_MANIFEST_SUFFIX):
+            manifest_paths.append(str(path))
+        else:
+            manifest_paths.append(get_playlist_manifest_path(str(path)))
+
+    failed = False
+
+    with open_extractor(
+        max_workers=jobs,
+        cache=SQLiteCache() if cache else None,
+    ) as extractor:
+        for manifest_path in dict.fromkeys(manifest_paths):
+            try:
+                click.echo(f"OK   {extractor.refresh_playlist(manifest_path)}")
+            except (OSError, ValueError, AnixartPlaylistExtractorError) as exception:
+                click.echo(f"FAIL {manifest_path}: {exception}", err=True)
+                failed = True
+
+    if failed:
+        raise SystemExit(1)
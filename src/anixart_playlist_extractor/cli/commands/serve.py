@@ -0,0 +1,75 @@
+import click
+
+from anixart_playlist_extractor import Quality
+
+
+@click.command(
+    "serve",
+    help="Serve playlists over HTTP, resolving Kodik links only when a track is played",
+)
+@click.option(
+    "-H",
+    "--host",
+    show_default=True,
+    default="127.0.0.1",
+    help="Address to listen on",
+    type=click.STRING,
+)
+@click.option(
+    "-p",
+    "--port",
+    show_default=True,
+    default=8000,
+    help="Port to listen on",
+    type=click.IntRange(min=0, max=65535),
+)
+@click.option(
+    "-q",
+    "--quality",
+    show_default=True,
+    default=Quality.q720.value,
+    help="Default video quality (can be overridden with ?quality=)",
+    type=click.Choice(
+        [quality.value for quality in Quality],
+        case_sensitive=False,
+    ),
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    show_default=True,
+    default=False,
+    help="Log requests",
+    is_flag=True,
+)
+def command_serve(
+    host: str,
+    port: int,
+    quality: str,
+    cache: bool,
+    verbose: bool,
+):
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.server import serve
+
+    click.echo(
+        f"Serving on http://{host}:{port}/playlist/RELEASE_ID/TYPE_ID.xspf "
+        "(or .m3u, ?only=1,2,3, ?last, ?quality=480)"
+    )
+
+    try:
+        serve(
+            host=host,
+            port=port,
+            quality=Quality(quality),
+            cache=SQLiteCache() if cache else None,
+            verbose=verbose,
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,82 @@
+from pathlib import Path
+import click
+
+from anixart_playlist_extractor.cli.options import ListOption
+
+
+@click.command(
+    "sync",
+    help="Refresh the local metadata store for releases whose last update changed",
+)
+@click.option(
+    "-rid",
+    "--release-ids",
+    show_default=True,
+    default=None,
+    help="Release IDs to add or refresh (all stored releases if omitted)",
+    cls=ListOption,
+)
+@click.option(
+    "-m",
+    "--manifest",
+    default=None,
+    help="Also sync releases of a manifest (as used by extract-batch and watch)",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-s",
+    "--store",
+    default=None,
+    help="Path to the metadata store (in the cache dir by default)",
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=4,
+    help="Number of releases to sync concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "-f",
+    "--force",
+    show_default=True,
+    default=False,
+    help="Refresh releases even if their last update did not change",
+    is_flag=True,
+)
+def command_sync(
+    release_ids: list[int] | None,
+    manifest: Path | None,
+    store: Path | None,
+    jobs: int,
+    force: bool,
+):
+    from anixart_playlist_extractor.batch import load_manifest
+    from anixart_playlist_extractor.sync import sync_store
+
+    release_ids = list(release_ids or [])
+    if manifest is not None:
+        release_ids += [job.release_id for job in load_manifest(str(manifest))]
+
+    results = sync_store(
+        list(dict.fromkeys(release_ids)),
+        store_path=str(store) if store is not None else None,
+        max_workers=jobs,
+        force=force,
+    )
+
+    for result in results:
+        if result.error is not None:
+            click.echo(f"FAIL {result.release_id}: {result.error}", err=True)
+        elif result.changed:
+            click.echo(
+                f"SYNC {result.release_id}: {result.types} types, "
+                f"{result.sources} sources, {result.episodes} episodes"
+            )
+        else:
+            click.echo(f"SKIP {result.release_id}: unchanged")
+
+    if any(result.error is not None for result in results):
+        raise SystemExit(1)
@@ -0,0 +1,93 @@
+from pathlib import Path
+import click
+
+
+@click.command(
+    "watch",
+    help="Keep playlists from a manifest up to date, polling releases for new episodes",
+)
+@click.option(
+    "-m",
+    "--manifest",
+    required=True,
+    help="Manifest with release_id, type_id, quality, extract_only, extract_last "
+    "and output_dir per subscription",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    show_default=True,
+    default="output",
+    help="Directory to save playlists of subscriptions without output_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=8,
+    help="Number of releases to poll concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--min-interval",
+    show_default=True,
+    default=15 * 60,
+    help="Poll interval of airing releases, seconds",
+    type=click.FloatRange(min=1),
+)
+@click.option(
+    "--max-interval",
+    show_default=True,
+    default=24 * 60 * 60,
+    help="Poll interval of long finished releases, seconds",
+    type=click.FloatRange(min=1),
+)
+@click.option(
+    "--once",
+    show_default=True,
+    default=False,
+    help="Poll every release once and exit",
+    is_flag=True,
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+def command_watch(
+    manifest: Path,
+    output_dir: Path,
+    jobs: int,
+    min_interval: float,
+    max_interval: float,
+    once: bool,
+    cache: bool,
+):
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.watch import WatchEvent, watch_manifest
+
+    def echo(event: WatchEvent) -> None:
+        job = event.state.job
+        job = f"{job.release_id}/{job.type_id} ({job.quality}p)"
+
+        if event.error is not None:
+            click.echo(f"FAIL {job}: {event.error}", err=True)
+        elif event.episodes:
+            click.echo(f"NEW  {job} -> {event.path} [+{event.episodes}]")
+
+    try:
+        watch_manifest(
+            str(manifest),
+            output_dir=str(output_dir),
+            max_workers=jobs,
+            min_interval=min_interval,
+            max_interval=max(min_interval, max_interval),
+            cache=SQLiteCache() if cache else None,
+            hooks=[echo],
+            once=once,
+        )
+    except KeyboardInterrupt:
+        pass
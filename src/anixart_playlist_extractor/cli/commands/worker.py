@@ -0,0 +1,107 @@
+from pathlib import Path
+import click
+
+
+@click.command(
+    "worker",
+    help="Lease jobs from a work queue and extract their playlists",
+)
+@click.option(
+    "-Q",
+    "--queue",
+    required=True,
+    help="Work queue shared by the workers: a path to an SQLite file or "
+    "`<backend>://...`",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    show_default=True,
+    default="output",
+    help="Directory to save playlists of jobs without output_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    show_default=True,
+    default=1,
+    help="Number of jobs to run concurrently",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--visibility-timeout",
+    show_default=True,
+    default=10 * 60,
+    help="Seconds after which a job of a worker that stopped responding is "
+    "delivered again",
+    type=click.FloatRange(min=1),
+)
+@click.option(
+    "--max-attempts",
+    show_default=True,
+    default=3,
+    help="Deliveries of a job before it is marked as failed",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--exit-when-empty",
+    show_default=True,
+    default=False,
+    help="Exit once no job is available instead of waiting for new ones",
+    is_flag=True,
+)
+@click.option(
+    "--cache/--no-cache",
+    show_default=True,
+    default=False,
+    help="Cache Anixart responses on disk",
+)
+def command_worker(
+    queue: str,
+    output_dir: Path,
+    jobs: int,
+    visibility_timeout: float,
+    max_attempts: int,
+    exit_when_empty: bool,
+    cache: bool,
+):
+    from anixart_playlist_extractor.cache import SQLiteCache
+    from anixart_playlist_extractor.work_queue import (
+        WorkerEvent,
+        parse_work_queue_location,
+        run_worker,
+    )
+
+    try:
+        parse_work_queue_location(queue)
+    except ValueError as exception:
+        raise click.BadParameter(str(exception), param_hint="--queue")
+
+    def echo(event: WorkerEvent) -> None:
+        job, result = event.lease.job, event.result
+        job = f"{job.release_id}/{job.type_id} ({job.quality}p)"
+        lost = "" if event.acked else " (lease lost)"
+
+        if result.ok:
+            click.echo(f"OK   {job} -> {result.path} [{result.elapsed:.2f}s]{lost}")
+        else:
+            click.echo(
+                f"FAIL {job}: {result.error} "
+                f"[attempt {event.lease.attempts}/{max_attempts}]{lost}",
+                err=True,
+            )
+
+    try:
+        run_worker(
+            queue,
+            output_dir=str(output_dir),
+            max_workers=jobs,
+            visibility_timeout=visibility_timeout,
+            max_attempts=max_attempts,
+            cache=SQLiteCache() if cache else None,
+            hooks=[echo],
+            exit_when_empty=exit_when_empty,
+        )
+    except KeyboardInterrupt:
+        pass
@@ -1,7 +1,28 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 from pydantic import BaseModel, ValidationError
-from requests import Session
+from requests import RequestException, Response, Session
+from requests.adapters import HTTPAdapter
 
+from anixart_playlist_extractor.cache import (
+    DEFAULT_TTLS,
+    ResponseCache,
+    build_cache_entry,
+    cache_key,
+    lookup_cache_entry,
+)
+from anixart_playlist_extractor.exceptions import (
+    RequestDeadlineError,
+    RequestError,
+    ResponseParseError,
+)
+from anixart_playlist_extractor.host_policy import HostPolicy
 from anixart_playlist_extractor.models import (
+    AnixartResponse,
     EpisodeResponse,
     EpisodeSourcesResponse,
     EpisodeTypesResponse,
@@ -11,6 +32,9 @@ from anixart_playlist_extractor.models import (
     TypeAllResponse,
     VideoLinksResponse,
 )
+from anixart_playlist_extractor.profiling import RequestEvent, RequestHook, emit
+from anixart_playlist_extractor.single_flight import SingleFlight
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
 
 ANIXART_URL = "api.anixart.tv"
 ANIXART_USER_AGENT = (
@@ -29,71 +53,393 @@ KODIK_USER_AGENT = (
 )
 KODIK_HEADERS = {"User-Agent": KODIK_USER_AGENT}
 
+DEFAULT_POOL_SIZE = 10
+
+
+class ConnectionStats(BaseModel):
+    scheme: str
+    host: str
+    port: int | None
+    connections: int
+    requests: int
+
+    @property
+    def reuse_rate(self) -> float:
+        # NOTE: share of requests served over an already open connection
+        return 1 - self.connections / self.requests if self.requests > 0 else 0.0
+
+
+def create_session(
+    *,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool_sizes: dict[str, int] | None = None,
+) -> Session:
+    session = Session()
+
+    for prefix in ("https://", "http://"):
+        session.mount(
+            prefix,
+            HTTPAdapter(pool_connections=4, pool_maxsize=pool_size),
+        )
+
+    # NOTE: `requests` picks the adapter with the longest matching prefix
+    for host, host_pool_size in (pool_sizes or {}).items():
+        for scheme in ("https", "http"):
+            session.mount(
+                f"{scheme}://{host}/",
+                HTTPAdapter(pool_connections=1, pool_maxsize=host_pool_size),
+            )
+
+    return session
+
+
+def parse_response[ResponseModel: BaseModel](
+    url: str,
+    response_model: ResponseModel,
+    content: bytes,
+    *,
+    event: RequestEvent | None,
+    hooks: list[RequestHook],
+) -> ResponseModel:
+    started = time.perf_counter()
+    try:
+        return response_model.model_validate_json(content)
+    except ValidationError as exception:
+        if event is not None:
+            event.error = str(exception)
+        raise ResponseParseError(url=url, content=content) from exception
+    finally:
+        if event is not None:
+            event.parse_time = time.perf_counter() - started
+            emit(hooks, event)
+
+
+def emit_request_error(
+    hooks: list[RequestHook],
+    event: RequestEvent | None,
+    exception: RequestError,
+    *,
+    started: float,
+) -> None:
+    if event is None:
+        return
+
+    event.status = getattr(exception, "status_code", None)
+    event.wall_time = time.perf_counter() - started
+    event.error = str(exception)
+    emit(hooks, event)
+
 
 class Client:
     def __init__(
         self,
         session: Session = None,
+        *,
+        cache: ResponseCache | None = None,
+        ttls: dict[str, float] | None = None,
+        video_links_cache: VideoLinksCache | None = None,
+        policies: dict[str, HostPolicy] | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_sizes: dict[str, int] | None = None,
+        hooks: list[RequestHook] | None = None,
+        anixart_host: str = ANIXART_URL,
+        kodik_host: str = KODIK_URL,
+        scheme: str = "https",
+        kodik_scheme: str = "http",
+        coalesce: bool = True,
     ) -> None:
-        self.session: Session = session if session is not None else Session()
+        self.session: Session = (
+            session
+            if session is not None
+            else create_session(pool_size=pool_size, pool_sizes=pool_sizes)
+        )
+        self.cache: ResponseCache | None = cache
+        self.ttls: dict[str, float] = DEFAULT_TTLS if ttls is None else ttls
+        self.video_links_cache: VideoLinksCache | None = video_links_cache
+        self.policies: dict[str, HostPolicy] = dict(policies or {})
+        # NOTE: identical requests in flight at the same time share one response
+        self.single_flight: SingleFlight | None = SingleFlight() if coalesce else None
+        self.hooks: list[RequestHook] = list(hooks or [])
+        self.anixart_host: str = anixart_host
+        self.kodik_host: str = kodik_host
+        self.scheme: str = scheme
+        # NOTE: the Kodik API has always been requested over plain HTTP
+        self.kodik_scheme: str = kodik_scheme
+        self.lock: threading.Lock = threading.Lock()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exception_type, exception_value, exception_traceback):
         self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.video_links_cache is not None:
+            self.video_links_cache.close()
+
+    def warm_up(
+        self,
+        hosts: tuple[str, ...] | None = None,
+        *,
+        connections: int = 1,
+    ) -> None:
+        hosts = hosts if hosts is not None else (self.anixart_host, self.kodik_host)
+
+        # NOTE: opens (and keeps alive) `connections` connections per host
+        def connect(host: str) -> None:
+            try:
+                scheme = self.kodik_scheme if host == self.kodik_host else self.scheme
+                self.session.head(f"{scheme}://{host}/", timeout=10)
+            except RequestException:
+                pass
+
+        with ThreadPoolExecutor(max_workers=len(hosts) * connections) as executor:
+            executor.map(connect, [host for host in hosts for _ in range(connections)])
+
+    def connection_stats(self) -> list[ConnectionStats]:
+        stats: list[ConnectionStats] = []
+
+        for adapter in set(self.session.adapters.values()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+
+                stats.append(
+                    ConnectionStats(
+                        scheme=pool.scheme,
+                        host=pool.host,
+                        port=pool.port,
+                        connections=pool.num_connections,
+                        requests=pool.num_requests,
+                    )
+                )
+
+        return stats
+
+    def get_anixart_url(self, path: str, *, host: str | None = None) -> str:
+        return f"{self.scheme}://{host or self.anixart_host}{path}"
+
+    def get_kodik_url(self, path: str, *, host: str | None = None) -> str:
+        return f"{self.kodik_scheme}://{host or self.kodik_host}{path}"
+
+    def get_host_policy(self, host: str) -> HostPolicy:
+        with self.lock:
+            if host not in self.policies:
+                self.policies[host] = HostPolicy()
+            return self.policies[host]
+
+    def send(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] = None,
+        params: dict[str, str] = None,
+        expires_at: float | None = None,
+    ) -> Response:
+        host = urlparse(url).netloc
+        policy = self.get_host_policy(host)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            time.sleep(policy.before_attempt(url=url, host=host, expires_at=expires_at))
+
+            try:
+                resp = self.session.get(
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=policy.get_timeouts(url=url, expires_at=expires_at),
+                )
+            except RequestException as exception:
+                time.sleep(
+                    policy.on_error(
+                        attempt, url=url, exception=exception, expires_at=expires_at
+                    )
+                )
+                continue
+
+            delay = policy.on_response(
+                attempt,
+                url=url,
+                status=resp.status_code,
+                retry_after=resp.headers.get("Retry-After"),
+                expires_at=expires_at,
+            )
+            if delay is None:
+                return resp
+
+            time.sleep(delay)
 
     def request[ResponseModel: BaseModel](
         self,
         url: str,
         response_model: ResponseModel,
         *,
+        endpoint: str | None = None,
         headers: dict[str, str] = None,
         params: dict[str, str] = None,
+        expires_at: float | None = None,
     ) -> ResponseModel:
-        resp = self.session.get(
-            url,
-            headers=headers,
-            params=params,
+        if self.single_flight is None:
+            return self.fetch(
+                url,
+                response_model,
+                endpoint=endpoint,
+                headers=headers,
+                params=params,
+                expires_at=expires_at,
+            )
+
+        started = time.perf_counter()
+        # NOTE: waiters get the very same model instance as the caller that sent it
+        while True:
+            try:
+                response, shared = self.single_flight.do(
+                    (cache_key(url, params), response_model),
+                    lambda: self.fetch(
+                        url,
+                        response_model,
+                        endpoint=endpoint,
+                        headers=headers,
+                        params=params,
+                        expires_at=expires_at,
+                    ),
+                )
+                break
+            except RequestDeadlineError as exception:
+                # NOTE: a waiter is not bound by the deadline of the caller it waited
+                # for, it sends the request again on its own
+                if exception.expires_at == expires_at:
+                    raise
+
+        if shared and self.hooks:
+            emit(
+                self.hooks,
+                RequestEvent(
+                    endpoint=endpoint,
+                    url=url,
+                    wall_time=time.perf_counter() - started,
+                    coalesced=True,
+                ),
+            )
+
+        return response
+
+    def fetch[ResponseModel: BaseModel](
+        self,
+        url: str,
+        response_model: ResponseModel,
+        *,
+        endpoint: str | None = None,
+        headers: dict[str, str] = None,
+        params: dict[str, str] = None,
+        expires_at: float | None = None,
+    ) -> ResponseModel:
+        key = cache_key(url, params)
+        ttl, entry = lookup_cache_entry(
+            self.cache,
+            self.ttls,
+            endpoint=endpoint,
+            key=key,
         )
+        event = RequestEvent(endpoint=endpoint, url=url) if self.hooks else None
 
-        if resp.status_code != 200:
-            raise Exception(f"Req {url} ends with status code: {resp.status_code}")
+        if entry is not None:
+            if entry.is_fresh():
+                if event is not None:
+                    event.cached = True
+                return parse_response(
+                    url,
+                    response_model,
+                    entry.content,
+                    event=event,
+                    hooks=self.hooks,
+                )
+            headers = {**(headers or {}), **entry.conditional_headers()}
 
+        started = time.perf_counter()
         try:
-            return response_model.model_validate_json(resp.content)
-        except ValidationError:
-            with open("errbody.json", "wb") as file:
-                file.write(resp.content)
+            resp = self.send(
+                url,
+                headers=headers,
+                params=params,
+                expires_at=expires_at,
+            )
+        except RequestError as exception:
+            emit_request_error(self.hooks, event, exception, started=started)
             raise
 
-    def get_release(
+        content = (
+            entry.content
+            if resp.status_code == 304 and entry is not None
+            else resp.content
+        )
+
+        if event is not None:
+            event.status = resp.status_code
+            event.wall_time = time.perf_counter() - started
+            event.bytes_received = len(resp.content)
+
+        response = parse_response(
+            url,
+            response_model,
+            content,
+            event=event,
+            hooks=self.hooks,
+        )
+
+        if ttl > 0:
+            self.cache.set(
+                key,
+                build_cache_entry(
+                    content,
+                    ttl=ttl,
+                    headers=resp.headers,
+                    previous=entry,
+                ),
+            )
+
+        return response
+
+    def get_release[ResponseModel: AnixartResponse](
         self,
         release_id: int,
         *,
-        host: str = ANIXART_URL,
+        response_model: ResponseModel = ReleaseResponse,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
-    ) -> ReleaseResponse:
+        expires_at: float | None = None,
+    ) -> ResponseModel:
         return self.request(
-            f"https://{host}/release/{release_id}",
-            ReleaseResponse,
+            self.get_anixart_url(f"/release/{release_id}", host=host),
+            response_model,
+            endpoint="release",
             headers=headers,
             params={
                 "extended_mode": True,
             },
+            expires_at=expires_at,
         )
 
     def get_episode_types(
         self,
         release_id: int,
         *,
-        host: str = ANIXART_URL,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
     ) -> EpisodeTypesResponse:
         return self.request(
-            f"https://{host}/episode/{release_id}",
+            self.get_anixart_url(f"/episode/{release_id}", host=host),
             EpisodeTypesResponse,
+            endpoint="episode_types",
             headers=headers,
+            expires_at=expires_at,
         )
 
     def get_episode_sources(
@@ -101,43 +447,60 @@ class Client:
         release_id: int,
         type_id: int,
         *,
-        host: str = ANIXART_URL,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
     ) -> EpisodeSourcesResponse:
         return self.request(
-            f"https://{host}/episode/{release_id}/{type_id}",
+            self.get_anixart_url(f"/episode/{release_id}/{type_id}", host=host),
             EpisodeSourcesResponse,
+            endpoint="episode_sources",
             headers=headers,
+            expires_at=expires_at,
         )
 
-    def get_episodes(
+    def get_episodes[ResponseModel: AnixartResponse](
         self,
         release_id: int,
         type_id: int,
         source_id: int,
         *,
-        host: str = ANIXART_URL,
+        response_model: ResponseModel = EpisodesResponse,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
-    ) -> EpisodesResponse:
+        expires_at: float | None = None,
+    ) -> ResponseModel:
         return self.request(
-            f"https://{host}/episode/{release_id}/{type_id}/{source_id}",
-            EpisodesResponse,
+            self.get_anixart_url(
+                f"/episode/{release_id}/{type_id}/{source_id}",
+                host=host,
+            ),
+            response_model,
+            endpoint="episodes",
             headers=headers,
+            expires_at=expires_at,
         )
 
-    def get_episode(
+    def get_episode[ResponseModel: AnixartResponse](
         self,
         release_id: int,
         source_id: int,
         position: int,
         *,
-        host: str = ANIXART_URL,
+        response_model: ResponseModel = EpisodeResponse,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
-    ) -> EpisodeResponse:
+        expires_at: float | None = None,
+    ) -> ResponseModel:
         return self.request(
-            f"https://{host}/episode/target/{release_id}/{source_id}/{position}",
-            EpisodeResponse,
+            self.get_anixart_url(
+                f"/episode/target/{release_id}/{source_id}/{position}",
+                host=host,
+            ),
+            response_model,
+            endpoint="episode",
             headers=headers,
+            expires_at=expires_at,
         )
 
     def get_episode_updates(
@@ -145,25 +508,31 @@ class Client:
         release_id: int,
         *,
         page: int = 0,
-        host: str = ANIXART_URL,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
     ) -> EpisodeUpdatesResponse:
         return self.request(
-            f"https://{host}/episode/updates/{release_id}/{page}",
+            self.get_anixart_url(f"/episode/updates/{release_id}/{page}", host=host),
             EpisodeUpdatesResponse,
+            endpoint="episode_updates",
             headers=headers,
+            expires_at=expires_at,
         )
 
     def get_type_all(
         self,
         *,
-        host: str = ANIXART_URL,
+        host: str | None = None,
         headers: dict[str, str] = ANIXART_HEADERS,
+        expires_at: float | None = None,
     ) -> TypeAllResponse:
         return self.request(
-            f"https://{host}/type/all",
+            self.get_anixart_url("/type/all", host=host),
             TypeAllResponse,
+            endpoint="type_all",
             headers=headers,
+            expires_at=expires_at,
         )
 
     def get_video_links(
@@ -174,12 +543,23 @@ class Client:
         ip: str,
         *,
         p: str = KODIK_UNKNOWN_PARAM,
-        host: str = KODIK_URL,
+        host: str | None = None,
         headers: dict[str, str] = KODIK_HEADERS,
+        expires_at: float | None = None,
+        use_cache: bool = True,
     ) -> VideoLinksResponse:
-        return self.request(
-            f"http://{host}/api/video-links",
+        # NOTE: without `use_cache` Kodik is always asked, the links are still cached
+        if (
+            use_cache
+            and self.video_links_cache is not None
+            and (video_links := self.video_links_cache.get(link, d, s, ip))
+        ):
+            return video_links
+
+        video_links = self.request(
+            self.get_kodik_url("/api/video-links", host=host),
             VideoLinksResponse,
+            endpoint="video_links",
             headers=headers,
             params={
                 "p": p,
@@ -188,8 +568,14 @@ class Client:
                 "s": s,
                 "ip": ip,
             },
+            expires_at=expires_at,
         )
 
+        if self.video_links_cache is not None:
+            self.video_links_cache.set(link, d, s, ip, video_links)
+
+        return video_links
+
 
 __all__ = (
     ANIXART_URL,
@@ -199,5 +585,10 @@ __all__ = (
     KODIK_URL,
     KODIK_HEADERS,
     KODIK_USER_AGENT,
+    DEFAULT_POOL_SIZE,
+    ConnectionStats,
     Client,
+    create_session,
+    parse_response,
+    emit_request_error,
 )
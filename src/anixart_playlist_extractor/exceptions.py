@@ -0,0 +1,109 @@
+class AnixartPlaylistExtractorError(Exception): ...
+
+
+class RequestError(AnixartPlaylistExtractorError):
+    def __init__(self, message: str, *, url: str) -> None:
+        super().__init__(message)
+        self.url: str = url
+
+
+class HTTPStatusError(RequestError):
+    def __init__(
+        self,
+        *,
+        url: str,
+        status_code: int,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(f"Req {url} ends with status code: {status_code}", url=url)
+        self.status_code: int = status_code
+        self.retry_after: float | None = retry_after
+
+
+class ResponseParseError(RequestError):
+    def __init__(self, *, url: str, content: bytes) -> None:
+        super().__init__(f"Req {url} returned an unexpected body", url=url)
+        self.content: bytes = content
+
+
+class CircuitOpenError(RequestError):
+    def __init__(self, *, url: str, host: str, retry_at: float) -> None:
+        super().__init__(f"Circuit for {host} is open, req {url} is rejected", url=url)
+        self.host: str = host
+        self.retry_at: float = retry_at
+
+
+class RequestDeadlineError(RequestError):
+    def __init__(self, *, url: str, expires_at: float) -> None:
+        super().__init__(f"Req {url} cannot finish before the deadline", url=url)
+        self.expires_at: float = expires_at
+
+
+class AnixartResponseError(AnixartPlaylistExtractorError):
+    def __init__(self, *, code: int) -> None:
+        super().__init__(f"Got AnixartResponse with error code: {code}")
+        self.code: int = code
+
+
+class NoSourcesError(AnixartPlaylistExtractorError):
+    def __init__(self, *, release_id: int, type_id: int) -> None:
+        super().__init__(f"No sources for TypeID: {type_id} (ReleaseID: {release_id})")
+        self.release_id: int = release_id
+        self.type_id: int = type_id
+
+
+class EpisodeResolutionError(AnixartPlaylistExtractorError):
+    def __init__(
+        self,
+        *,
+        release_id: int,
+        source_id: int,
+        position: int,
+        reason: BaseException,
+    ) -> None:
+        super().__init__(
+            f"Failed to resolve episode {position} "
+            f"(ReleaseID: {release_id}, SourceID: {source_id}): {reason}"
+        )
+        self.release_id: int = release_id
+        self.source_id: int = source_id
+        self.position: int = position
+        self.reason: BaseException = reason
+
+
+class DeadlineExceededError(AnixartPlaylistExtractorError):
+    def __init__(
+        self,
+        *,
+        release_id: int,
+        source_id: int,
+        missing: list[int],
+    ) -> None:
+        super().__init__(
+            f"Deadline exceeded with {len(missing)} episodes unresolved "
+            f"(ReleaseID: {release_id}, SourceID: {source_id}): "
+            f"{', '.join(map(str, missing))}"
+        )
+        self.release_id: int = release_id
+        self.source_id: int = source_id
+        self.missing: list[int] = missing
+        # NOTE: filled in once the partial playlists are written
+        self.paths: list[str] = []
+
+
+class ManifestError(AnixartPlaylistExtractorError): ...
+
+
+__all__ = (
+    AnixartPlaylistExtractorError,
+    RequestError,
+    HTTPStatusError,
+    ResponseParseError,
+    CircuitOpenError,
+    RequestDeadlineError,
+    AnixartResponseError,
+    NoSourcesError,
+    EpisodeResolutionError,
+    DeadlineExceededError,
+    ManifestError,
+)
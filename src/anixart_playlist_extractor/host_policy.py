@@ -0,0 +1,259 @@
+import random
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+
+from pydantic import BaseModel
+
+from anixart_playlist_extractor.exceptions import (
+    CircuitOpenError,
+    HTTPStatusError,
+    RequestDeadlineError,
+    RequestError,
+)
+from anixart_playlist_extractor.utils import get_remaining
+
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+
+class RetryPolicy(BaseModel):
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: float = 0.5  # NOTE: fraction of the delay that is randomized
+    retry_after_max: float = 120.0
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def get_delay(
+        self,
+        attempt: int,
+        *,
+        retry_after: float | None = None,
+    ) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+
+class TokenBucket:
+    def __init__(self, rate: float, *, capacity: float | None = None) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens: float = self.capacity
+        self.updated_at: float = time.monotonic()
+        self.lock: threading.Lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # NOTE: takes a token (possibly going negative) and returns how long to wait
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated_at) * self.rate,
+            )
+            self.updated_at = now
+            self.tokens -= 1
+
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self.opened_at: float | None = None
+        self.probing: bool = False
+        self.lock: threading.Lock = threading.Lock()
+
+    def check(self, *, url: str, host: str) -> None:
+        with self.lock:
+            if self.opened_at is None:
+                return
+
+            retry_at = self.opened_at + self.reset_timeout
+
+            # NOTE: half-open, let a single request probe the host
+            if time.monotonic() >= retry_at and not self.probing:
+                self.probing = True
+                return
+
+            raise CircuitOpenError(
+                url=url,
+                host=host,
+                retry_at=time.time() + max(0.0, retry_at - time.monotonic()),
+            )
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class HostPolicy:
+    def __init__(
+        self,
+        *,
+        retry: RetryPolicy | None = None,
+        rate: float | None = None,
+        burst: float | None = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+    ) -> None:
+        self.retry: RetryPolicy = retry if retry is not None else RetryPolicy()
+        self.rate_limiter: TokenBucket | None = (
+            TokenBucket(rate, capacity=burst) if rate is not None else None
+        )
+        self.circuit_breaker: CircuitBreaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+        )
+        # NOTE: `read_timeout` bounds every wait for the next bytes, so a hung
+        # connection fails (and is retried) instead of stalling forever
+        self.connect_timeout: float = connect_timeout
+        self.read_timeout: float = read_timeout
+
+    # NOTE: the retry loop of `Client.send` and `AsyncClient.send` is driven by the
+    # methods below, only sleeping and sending differ between the two; `expires_at`
+    # bounds every wait, so a request gives up instead of outliving the deadline
+
+    def before_attempt(
+        self,
+        *,
+        url: str,
+        host: str,
+        expires_at: float | None = None,
+    ) -> float:
+        # NOTE: raises while the circuit is open, returns the rate limiter wait
+        self.circuit_breaker.check(url=url, host=host)
+
+        delay = self.rate_limiter.reserve() if self.rate_limiter is not None else 0.0
+
+        return check_deadline(delay, url=url, expires_at=expires_at)
+
+    def get_timeouts(
+        self,
+        *,
+        url: str,
+        expires_at: float | None = None,
+    ) -> tuple[float, float]:
+        remaining = get_remaining(expires_at)
+        if remaining is None:
+            return self.connect_timeout, self.read_timeout
+
+        if remaining <= 0:
+            raise RequestDeadlineError(url=url, expires_at=expires_at)
+
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+    def on_error(
+        self,
+        attempt: int,
+        *,
+        url: str,
+        exception: Exception,
+        expires_at: float | None = None,
+    ) -> float:
+        # NOTE: returns the delay before the next attempt or raises if there is none;
+        # a timeout cut short by the deadline says nothing about the host
+        if get_remaining(expires_at) == 0:
+            raise RequestDeadlineError(url=url, expires_at=expires_at) from exception
+
+        self.circuit_breaker.record_failure()
+
+        if attempt >= self.retry.max_attempts:
+            raise RequestError(f"Req {url} failed: {exception}", url=url) from exception
+
+        return check_deadline(
+            self.retry.get_delay(attempt),
+            url=url,
+            expires_at=expires_at,
+        )
+
+    def on_response(
+        self,
+        attempt: int,
+        *,
+        url: str,
+        status: int,
+        retry_after: str | None = None,
+        expires_at: float | None = None,
+    ) -> float | None:
+        # NOTE: None if the response is final, else the delay before the next attempt
+        if status not in self.retry.retry_statuses:
+            self.circuit_breaker.record_success()
+            if status not in (200, 304):
+                raise HTTPStatusError(url=url, status_code=status)
+            return None
+
+        self.circuit_breaker.record_failure()
+        delay = parse_retry_after(retry_after)
+
+        if attempt >= self.retry.max_attempts or (
+            delay is not None and delay > self.retry.retry_after_max
+        ):
+            raise HTTPStatusError(url=url, status_code=status, retry_after=delay)
+
+        return check_deadline(
+            self.retry.get_delay(attempt, retry_after=delay),
+            url=url,
+            expires_at=expires_at,
+        )
+
+
+def check_deadline(delay: float, *, url: str, expires_at: float | None) -> float:
+    # NOTE: a wait that would end past the deadline fails right away instead
+    remaining = get_remaining(expires_at)
+    if remaining is not None and delay >= remaining:
+        raise RequestDeadlineError(url=url, expires_at=expires_at)
+
+    return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+__all__ = (
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    RetryPolicy,
+    TokenBucket,
+    CircuitBreaker,
+    HostPolicy,
+    check_deadline,
+    parse_retry_after,
+)
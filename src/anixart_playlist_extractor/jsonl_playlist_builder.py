@@ -0,0 +1,47 @@
+import io
+
+from typing import Iterable, TextIO
+
+from anixart_playlist_extractor.models import Playlist, PlaylistVideo
+from anixart_playlist_extractor.utils import atomic_write
+
+
+class JSONLWriter:
+    def __init__(self, file: TextIO, title: str) -> None:
+        self.file: TextIO = file
+        self.title: str = title
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback): ...
+
+    def write_track(self, video: PlaylistVideo) -> None:
+        # NOTE: one record per line, flushed, so a reader on a pipe gets it right away
+        self.file.write(video.model_dump_json(exclude={"url"}) + "\n")
+        self.file.flush()
+
+
+def write_playlist(
+    path: str,
+    title: str,
+    videos: Iterable[PlaylistVideo],
+) -> None:
+    with atomic_write(path) as file, JSONLWriter(file, title) as writer:
+        for video in videos:
+            writer.write_track(video)
+
+
+def build_playlist(playlist: Playlist) -> str:
+    with io.StringIO() as file:
+        with JSONLWriter(file, playlist.title) as writer:
+            for video in playlist.videos:
+                writer.write_track(video)
+        return file.getvalue()
+
+
+__all__ = (
+    JSONLWriter,
+    write_playlist,
+    build_playlist,
+)
@@ -0,0 +1,63 @@
+import io
+
+from typing import Iterable, TextIO
+
+from anixart_playlist_extractor.models import Playlist, PlaylistVideo
+from anixart_playlist_extractor.utils import atomic_write
+
+PLAYLIST_HEADER = """#EXTM3U
+#PLAYLIST:{title}
+"""
+PLAYLIST_TRACK = """#EXTINF:-1,{title}
+{location}
+"""
+
+
+def clean_line(value: str) -> str:
+    # NOTE: m3u is line based, a newline in a title would start a new entry
+    return " ".join(value.splitlines())
+
+
+class M3UWriter:
+    def __init__(self, file: TextIO, title: str) -> None:
+        self.file: TextIO = file
+        self.title: str = title
+
+    def __enter__(self):
+        self.file.write(PLAYLIST_HEADER.format(title=clean_line(self.title)))
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback): ...
+
+    def write_track(self, video: PlaylistVideo) -> None:
+        self.file.write(
+            PLAYLIST_TRACK.format(
+                title=clean_line(video.title),
+                location=clean_line(video.location),
+            )
+        )
+
+
+def write_playlist(
+    path: str,
+    title: str,
+    videos: Iterable[PlaylistVideo],
+) -> None:
+    with atomic_write(path) as file, M3UWriter(file, title) as writer:
+        for video in videos:
+            writer.write_track(video)
+
+
+def build_playlist(playlist: Playlist) -> str:
+    with io.StringIO() as file:
+        with M3UWriter(file, playlist.title) as writer:
+            for video in playlist.videos:
+                writer.write_track(video)
+        return file.getvalue()
+
+
+__all__ = (
+    M3UWriter,
+    write_playlist,
+    build_playlist,
+)
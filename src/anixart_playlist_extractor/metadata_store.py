@@ -0,0 +1,317 @@
+import os
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from anixart_playlist_extractor.cache import default_cache_dir
+from anixart_playlist_extractor.models import (
+    EpisodeSummary,
+    ReleaseSummary,
+    Source,
+    Type,
+)
+from anixart_playlist_extractor.utils import get_timestamp
+
+METADATA_STORE_FILENAME = "metadata.sqlite3"
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS releases (
+    id INTEGER PRIMARY KEY,
+    title_ru TEXT,
+    title_original TEXT,
+    last_update_date INTEGER,
+    episode_last_update INTEGER,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS types (
+    release_id INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    episodes_count INTEGER,
+    PRIMARY KEY (release_id, type_id)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    release_id INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    source_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    episodes_count INTEGER,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (release_id, type_id, source_id)
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    release_id INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    source_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (release_id, type_id, source_id, position)
+);
+CREATE INDEX IF NOT EXISTS episodes_source_position
+    ON episodes (release_id, source_id, position);
+"""
+
+
+class MetadataStore:
+    def __init__(self, path: str | None = None) -> None:
+        self.path: str = path if path is not None else default_metadata_store_path()
+        self.lock: threading.Lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def release_ids(self) -> list[int]:
+        with self.lock:
+            rows = self.connection.execute("SELECT id FROM releases ORDER BY id")
+            return [release_id for (release_id,) in rows.fetchall()]
+
+    def get_release(self, release_id: int) -> ReleaseSummary | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT id, title_ru, title_original, last_update_date, "
+                "episode_last_update FROM releases WHERE id = ?",
+                (release_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return ReleaseSummary(
+            id=row[0],
+            title_ru=row[1],
+            title_original=row[2],
+            last_update_date=row[3],
+            episode_last_update=row[4],
+        )
+
+    def get_types(self, release_id: int) -> dict[int, str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT type_id, name FROM types WHERE release_id = ? ORDER BY type_id",
+                (release_id,),
+            ).fetchall()
+
+        return dict(rows)
+
+    def get_source_ids(self, release_id: int, type_id: int) -> list[int]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT source_id FROM sources "
+                "WHERE release_id = ? AND type_id = ? ORDER BY rank",
+                (release_id, type_id),
+            ).fetchall()
+
+        return [source_id for (source_id,) in rows]
+
+    def get_episodes(
+        self,
+        release_id: int,
+        type_id: int,
+        source_id: int,
+    ) -> list[EpisodeSummary]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT position, name, url FROM episodes "
+                "WHERE release_id = ? AND type_id = ? AND source_id = ? "
+                "ORDER BY position",
+                (release_id, type_id, source_id),
+            ).fetchall()
+
+        return [
+            EpisodeSummary(position=position, name=name, url=url)
+            for position, name, url in rows
+        ]
+
+    def get_episode(
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+    ) -> EpisodeSummary | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT position, name, url FROM episodes "
+                "WHERE release_id = ? AND source_id = ? AND position = ?",
+                (release_id, source_id, position),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return EpisodeSummary(position=row[0], name=row[1], url=row[2])
+
+    def put_release(self, release: ReleaseSummary) -> None:
+        with self.transaction() as connection:
+            self.write_release(connection, release)
+
+    def put_sources(self, release_id: int, type_id: int, sources: list[Source]) -> None:
+        with self.transaction() as connection:
+            self.write_sources(connection, release_id, type_id, sources)
+
+    def put_episodes(
+        self,
+        release_id: int,
+        type_id: int,
+        source_id: int,
+        episodes: list[EpisodeSummary],
+    ) -> None:
+        with self.transaction() as connection:
+            self.write_episodes(connection, release_id, type_id, source_id, episodes)
+
+    def put_snapshot(
+        self,
+        release: ReleaseSummary,
+        types: list[Type],
+        sources: dict[int, list[Source]],
+        episodes: dict[tuple[int, int], list[EpisodeSummary]],
+    ) -> None:
+        # NOTE: replaces everything stored for the release at once, readers never see
+        # a release with the new types but the old episodes
+        with self.transaction() as connection:
+            for table in ("types", "sources", "episodes"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE release_id = ?",
+                    (release.id,),
+                )
+
+            self.write_release(connection, release)
+            connection.executemany(
+                "INSERT INTO types (release_id, type_id, name, episodes_count) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (release.id, type.id, type.name, type.episodes_count)
+                    for type in types
+                ],
+            )
+            for type_id, type_sources in sources.items():
+                self.write_sources(connection, release.id, type_id, type_sources)
+            for (type_id, source_id), source_episodes in episodes.items():
+                self.write_episodes(
+                    connection,
+                    release.id,
+                    type_id,
+                    source_id,
+                    source_episodes,
+                )
+
+    def write_release(
+        self,
+        connection: sqlite3.Connection,
+        release: ReleaseSummary,
+    ) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO releases (id, title_ru, title_original, "
+            "last_update_date, episode_last_update, synced_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                release.id,
+                release.title_ru,
+                release.title_original,
+                get_timestamp(release.last_update_date),
+                get_timestamp(release.episode_last_update),
+                time.time(),
+            ),
+        )
+
+    def write_sources(
+        self,
+        connection: sqlite3.Connection,
+        release_id: int,
+        type_id: int,
+        sources: list[Source],
+    ) -> None:
+        connection.execute(
+            "DELETE FROM sources WHERE release_id = ? AND type_id = ?",
+            (release_id, type_id),
+        )
+        # NOTE: `rank` keeps the order Anixart lists the sources in
+        connection.executemany(
+            "INSERT INTO sources "
+            "(release_id, type_id, source_id, name, episodes_count, rank) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    release_id,
+                    type_id,
+                    source.id,
+                    source.name,
+                    source.episodes_count,
+                    rank,
+                )
+                for rank, source in enumerate(sources)
+            ],
+        )
+
+    def write_episodes(
+        self,
+        connection: sqlite3.Connection,
+        release_id: int,
+        type_id: int,
+        source_id: int,
+        episodes: list[EpisodeSummary],
+    ) -> None:
+        connection.execute(
+            "DELETE FROM episodes "
+            "WHERE release_id = ? AND type_id = ? AND source_id = ?",
+            (release_id, type_id, source_id),
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO episodes "
+            "(release_id, type_id, source_id, position, name, url) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    release_id,
+                    type_id,
+                    source_id,
+                    episode.position,
+                    episode.name,
+                    episode.url,
+                )
+                for episode in episodes
+            ],
+        )
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+def default_metadata_store_path() -> str:
+    return os.path.join(default_cache_dir(), METADATA_STORE_FILENAME)
+
+
+__all__ = (
+    METADATA_STORE_FILENAME,
+    MetadataStore,
+    default_metadata_store_path,
+)
@@ -2,21 +2,36 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class PlaylistVideo(BaseModel):
+class LazyModel(BaseModel):
+    # NOTE: validators are built on first use, most responses are never parsed per run
+    model_config = ConfigDict(defer_build=True)
+
+
+class PlaylistVideo(LazyModel):
     id: int
     title: str
     location: str
+    url: str | None = None  # NOTE: Kodik iframe url, to refresh the expired location
 
 
-class Playlist(BaseModel):
+class Playlist(LazyModel):
     title: str
     videos: list[PlaylistVideo]
 
 
-class Related(BaseModel):
+class PlaylistPlan(LazyModel):
+    release_id: int
+    type_id: int
+    source_id: int
+    title: str
+    positions: list[int]
+    titles: dict[int, str] = {}  # NOTE: episode names by position
+
+
+class Related(LazyModel):
     id: int
     name: str | None
     description: str | None
@@ -26,17 +41,17 @@ class Related(BaseModel):
     release_count: int | None
 
 
-class Category(BaseModel):
+class Category(LazyModel):
     id: int
     name: str
 
 
-class Status(BaseModel):
+class Status(LazyModel):
     id: int
     name: str
 
 
-class Profile(BaseModel):
+class Profile(LazyModel):
     id: int
     login: str | None
     avatar: str | None
@@ -52,7 +67,7 @@ class Profile(BaseModel):
     is_verified: bool | None
 
 
-class Comment(BaseModel):
+class Comment(LazyModel):
     id: int
     profile: Profile | int | None  # NOTE: jackson feature
     message: str | None
@@ -71,7 +86,7 @@ class Comment(BaseModel):
     can_like: bool | None
 
 
-class VideoBanner(BaseModel):
+class VideoBanner(LazyModel):
     name: str
     image: str | None
     value: str | None
@@ -79,7 +94,7 @@ class VideoBanner(BaseModel):
     is_new: bool | None
 
 
-class Release(BaseModel):
+class Release(LazyModel):
     field_id: int = Field(..., alias="@id")
     id: int
     poster: str | None
@@ -153,7 +168,7 @@ class Release(BaseModel):
     is_release_type_notifications_enabled: bool | None
 
 
-class Type(BaseModel):
+class Type(LazyModel):
     field_id: int = Field(..., alias="@id")
     id: int
     name: str
@@ -165,7 +180,7 @@ class Type(BaseModel):
     pinned: bool | None
 
 
-class Source(BaseModel):
+class Source(LazyModel):
     field_id: int = Field(..., alias="@id")
     id: int
     type: Type | int | None  # NOTE: jackson feature
@@ -173,7 +188,7 @@ class Source(BaseModel):
     episodes_count: int | None
 
 
-class Episode(BaseModel):
+class Episode(LazyModel):
     field_id: int = Field(..., alias="@id")
     position: int
     release: Release | int  # NOTE: jackson feature
@@ -186,18 +201,18 @@ class Episode(BaseModel):
     is_watched: bool | None
 
 
-class LinksField(BaseModel):
+class LinksField(LazyModel):
     Src: str
     Type: str
 
 
-class Links(BaseModel):
+class Links(LazyModel):
     field_360: LinksField = Field(..., alias="360")
     field_480: LinksField = Field(..., alias="480")
     field_720: LinksField = Field(..., alias="720")
 
 
-class EpisodeUpdate(BaseModel):
+class EpisodeUpdate(LazyModel):
     last_episode_update_date: int
     last_episode_update_name: str
     last_episode_source_update_id: int
@@ -206,7 +221,23 @@ class EpisodeUpdate(BaseModel):
     lastEpisodeTypeUpdateName: str
 
 
-class AnixartResponse(BaseModel):
+# NOTE: projections, validate only the fields the extractor uses (extra fields are
+# ignored)
+class ReleaseSummary(LazyModel):
+    id: int
+    title_ru: str | None
+    title_original: str | None = None
+    last_update_date: int | None = None
+    episode_last_update: Any = None  # TODO: obtain real type (timestamp -> int)
+
+
+class EpisodeSummary(LazyModel):
+    position: int
+    name: str
+    url: str
+
+
+class AnixartResponse(LazyModel):
     code: int
 
 
@@ -230,7 +261,7 @@ class EpisodeResponse(AnixartResponse):
     episode: Episode | None
 
 
-class VideoLinksResponse(BaseModel):
+class VideoLinksResponse(LazyModel):
     links: Links
 
 
@@ -245,6 +276,18 @@ class TypeAllResponse(AnixartResponse):
     types: list[Type]
 
 
+class ReleaseSummaryResponse(AnixartResponse):
+    release: ReleaseSummary | None
+
+
+class EpisodesSummaryResponse(AnixartResponse):
+    episodes: list[EpisodeSummary]
+
+
+class EpisodeSummaryResponse(AnixartResponse):
+    episode: EpisodeSummary | None
+
+
 def model_validate_json[ModelType: BaseModel](
     model_type: ModelType,
     json_data: str | bytes | bytearray,
@@ -253,8 +296,10 @@ def model_validate_json[ModelType: BaseModel](
 
 
 __all__ = (
+    LazyModel,
     PlaylistVideo,
     Playlist,
+    PlaylistPlan,
     # Data
     Related,
     Category,
@@ -269,6 +314,8 @@ __all__ = (
     LinksField,
     Links,
     EpisodeUpdate,
+    ReleaseSummary,
+    EpisodeSummary,
     # Responses
     AnixartResponse,
     ReleaseResponse,
@@ -279,6 +326,9 @@ __all__ = (
     VideoLinksResponse,
     EpisodeUpdatesResponse,
     TypeAllResponse,
+    ReleaseSummaryResponse,
+    EpisodesSummaryResponse,
+    EpisodeSummaryResponse,
     # functions
     model_validate_json,
 )
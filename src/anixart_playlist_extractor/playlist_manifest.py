@@ -0,0 +1,95 @@
+import glob
+import os
+
+from pydantic import BaseModel, ValidationError
+
+from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.models import PlaylistVideo
+from anixart_playlist_extractor.utils import atomic_write
+
+PLAYLIST_MANIFEST_SUFFIX = ".axapex.json"
+
+
+class PlaylistManifest(BaseModel):
+    release_id: int
+    type_id: int
+    source_id: int
+    quality: Quality
+    title: str
+    playlist: str  # NOTE: playlist file name, relative to the manifest
+    videos: list[PlaylistVideo]
+
+
+# NOTE: projection, indexing a directory does not validate every stored video
+class PlaylistManifestKey(BaseModel):
+    release_id: int
+    type_id: int
+    quality: Quality
+
+
+type PlaylistManifestIndex = dict[tuple[int, int, Quality], str]
+
+
+def get_playlist_manifest_path(playlist_path: str) -> str:
+    return f"{os.path.splitext(playlist_path)[0]}{PLAYLIST_MANIFEST_SUFFIX}"
+
+
+def read_playlist_manifest(path: str) -> PlaylistManifest:
+    with open(path, "rb") as file:
+        return PlaylistManifest.model_validate_json(file.read())
+
+
+def write_playlist_manifest(path: str, manifest: PlaylistManifest) -> None:
+    with atomic_write(path) as file:
+        file.write(manifest.model_dump_json(indent=2))
+
+
+def list_playlist_manifests(output_dir: str) -> list[str]:
+    return sorted(
+        glob.glob(os.path.join(glob.escape(output_dir), f"*{PLAYLIST_MANIFEST_SUFFIX}"))
+    )
+
+
+def index_playlist_manifests(output_dir: str) -> PlaylistManifestIndex:
+    index: PlaylistManifestIndex = {}
+
+    for path in list_playlist_manifests(output_dir):
+        try:
+            with open(path, "rb") as file:
+                key = PlaylistManifestKey.model_validate_json(file.read())
+        except (OSError, ValidationError):
+            continue
+
+        # NOTE: the first manifest (by file name) wins, as in `find_playlist_manifest`
+        index.setdefault((key.release_id, key.type_id, key.quality), path)
+
+    return index
+
+
+def find_playlist_manifest(
+    output_dir: str,
+    release_id: int,
+    type_id: int,
+    *,
+    quality: Quality = Quality.q720,
+    index: PlaylistManifestIndex | None = None,
+) -> str | None:
+    # NOTE: pass an `index` to look up many releases with one scan of the directory
+    if index is None:
+        index = index_playlist_manifests(output_dir)
+
+    return index.get((release_id, type_id, quality))
+
+
+__all__ = (
+    PLAYLIST_MANIFEST_SUFFIX,
+    PlaylistManifest,
+    PlaylistManifestKey,
+    PlaylistManifestIndex,
+    get_playlist_manifest_path,
+    read_playlist_manifest,
+    write_playlist_manifest,
+    list_playlist_manifests,
+    index_playlist_manifests,
+    find_playlist_manifest,
+)
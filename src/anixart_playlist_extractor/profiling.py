@@ -0,0 +1,149 @@
+import json
+import math
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from pydantic import BaseModel
+
+
+class RequestEvent(BaseModel):
+    endpoint: str | None
+    url: str
+    status: int | None = None
+    wall_time: float = 0.0
+    parse_time: float = 0.0
+    bytes_received: int = 0
+    cached: bool = False
+    coalesced: bool = False
+    error: str | None = None
+
+
+class PhaseEvent(BaseModel):
+    phase: str
+    wall_time: float
+
+
+type RequestHook = Callable[[RequestEvent], None]
+type PhaseHook = Callable[[PhaseEvent], None]
+
+
+@contextmanager
+def measure_phase(hooks: list[PhaseHook], phase: str) -> Iterator[None]:
+    if not hooks:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        emit(hooks, PhaseEvent(phase=phase, wall_time=time.perf_counter() - started))
+
+
+def emit[Event: BaseModel](hooks: list[Callable[[Event], None]], event: Event) -> None:
+    for hook in hooks:
+        hook(event)
+
+
+def percentile(values: list[float], q: float) -> float:
+    # NOTE: nearest-rank
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, math.ceil(q * len(values)) - 1))]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "total": sum(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "max": max(values, default=0.0),
+    }
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.requests: list[RequestEvent] = []
+        self.phases: list[PhaseEvent] = []
+        self.lock: threading.Lock = threading.Lock()
+        self.started: float = time.perf_counter()
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self.lock:
+            self.requests.append(event)
+
+    def on_phase(self, event: PhaseEvent) -> None:
+        with self.lock:
+            self.phases.append(event)
+
+    def report(self) -> dict:
+        with self.lock:
+            requests = list(self.requests)
+            phases = list(self.phases)
+
+        endpoints: dict[str, list[RequestEvent]] = {}
+        for event in requests:
+            endpoints.setdefault(event.endpoint or event.url, []).append(event)
+
+        phase_times: dict[str, list[float]] = {}
+        for event in phases:
+            phase_times.setdefault(event.phase, []).append(event.wall_time)
+
+        return {
+            "wall_time": time.perf_counter() - self.started,
+            "endpoints": {
+                endpoint: {
+                    "count": len(events),
+                    "cached": sum(event.cached for event in events),
+                    "coalesced": sum(event.coalesced for event in events),
+                    "errors": sum(event.error is not None for event in events),
+                    "statuses": {
+                        str(status): sum(event.status == status for event in events)
+                        for status in sorted(
+                            {
+                                event.status
+                                for event in events
+                                if event.status is not None
+                            }
+                        )
+                    },
+                    "bytes_received": sum(event.bytes_received for event in events),
+                    "wall_time": summarize([event.wall_time for event in events]),
+                    "parse_time": summarize([event.parse_time for event in events]),
+                }
+                for endpoint, events in sorted(endpoints.items())
+            },
+            "phases": {
+                phase: {"count": len(times), "wall_time": summarize(times)}
+                for phase, times in sorted(phase_times.items())
+            },
+        }
+
+    def write_report(self, path: str) -> None:
+        report = json.dumps(self.report(), indent=2)
+
+        # NOTE: "-" goes to stderr to keep stdout for the command output
+        if path == "-":
+            print(report, file=sys.stderr)
+            return
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(report)
+
+
+__all__ = (
+    RequestEvent,
+    PhaseEvent,
+    RequestHook,
+    PhaseHook,
+    measure_phase,
+    emit,
+    percentile,
+    summarize,
+    Profiler,
+)
@@ -0,0 +1,225 @@
+import re
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from anixart_playlist_extractor import m3u_playlist_builder, vlc_playlist_builder
+from anixart_playlist_extractor.anixart_playlist_extractor import (
+    AnixartPlaylistExtractor,
+)
+from anixart_playlist_extractor.cache import MemoryCache, ResponseCache
+from anixart_playlist_extractor.client import Client
+from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.exceptions import AnixartPlaylistExtractorError
+from anixart_playlist_extractor.models import Playlist, PlaylistPlan, PlaylistVideo
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+PLAYLIST_PATTERN = re.compile(r"/playlist/(\d+)/(\d+)\.(xspf|m3u8?)")
+EPISODE_PATTERN = re.compile(r"/episode/(\d+)/(\d+)/(\d+)")
+
+PLAYLIST_FORMATS = {
+    "xspf": ("application/xspf+xml", vlc_playlist_builder.build_playlist),
+    "m3u": ("audio/x-mpegurl", m3u_playlist_builder.build_playlist),
+    "m3u8": ("audio/x-mpegurl", m3u_playlist_builder.build_playlist),
+}
+
+
+class PlaylistRequestHandler(BaseHTTPRequestHandler):
+    server: "PlaylistServer"
+
+    def log_message(self, format, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+
+        try:
+            quality = Quality(query.get("quality", [self.server.quality])[0])
+        except ValueError:
+            return self.send_text(HTTPStatus.BAD_REQUEST, "Unknown quality")
+
+        try:
+            if match := PLAYLIST_PATTERN.fullmatch(url.path):
+                return self.send_playlist(
+                    int(match[1]),
+                    int(match[2]),
+                    playlist_format=match[3],
+                    quality=quality,
+                    extract_only=get_positions(query),
+                    extract_last="last" in query,
+                )
+
+            if match := EPISODE_PATTERN.fullmatch(url.path):
+                return self.send_episode(
+                    int(match[1]),
+                    int(match[2]),
+                    int(match[3]),
+                    quality=quality,
+                )
+        except ValueError as exception:
+            return self.send_text(HTTPStatus.BAD_REQUEST, str(exception))
+        except AnixartPlaylistExtractorError as exception:
+            return self.send_text(HTTPStatus.BAD_GATEWAY, str(exception))
+        except ConnectionError:
+            # NOTE: the player went away, there is no one to reply to
+            return None
+        except Exception as exception:
+            self.log_error("Failed to handle %s: %r", self.path, exception)
+            return self.send_text(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error")
+
+        self.send_text(HTTPStatus.NOT_FOUND, "Not found")
+
+    def send_playlist(
+        self,
+        release_id: int,
+        type_id: int,
+        *,
+        playlist_format: str,
+        quality: Quality,
+        extract_only: list[int] | None,
+        extract_last: bool,
+    ) -> None:
+        # NOTE: only the plan is resolved here, Kodik is asked when a track is played
+        plan = self.server.extractor.plan_playlist(
+            release_id,
+            type_id,
+            extract_only=extract_only,
+            extract_last=extract_last,
+        )
+        content_type, build_playlist = PLAYLIST_FORMATS[playlist_format]
+
+        self.send_content(
+            HTTPStatus.OK,
+            build_playlist(
+                get_lazy_playlist(
+                    plan,
+                    base_url=f"http://{self.headers['Host'] or self.server.host}",
+                    quality=quality,
+                )
+            ).encode(),
+            content_type=content_type,
+        )
+
+    def send_episode(
+        self,
+        release_id: int,
+        source_id: int,
+        position: int,
+        *,
+        quality: Quality,
+    ) -> None:
+        video = self.server.extractor.get_playlist_video(
+            release_id,
+            source_id,
+            position,
+            quality=quality,
+        )
+
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header("Location", video.location)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_text(self, status: HTTPStatus, text: str) -> None:
+        self.send_content(status, text.encode(), content_type="text/plain")
+
+    def send_content(
+        self,
+        status: HTTPStatus,
+        content: bytes,
+        *,
+        content_type: str,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class PlaylistServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 8000),
+        *,
+        client: Client | None = None,
+        quality: Quality = Quality.q720,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, PlaylistRequestHandler)
+        self.extractor: AnixartPlaylistExtractor = AnixartPlaylistExtractor(client)
+        self.quality: Quality = quality
+        self.verbose: bool = verbose
+
+    @property
+    def host(self) -> str:
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+
+def get_positions(query: dict[str, list[str]]) -> list[int] | None:
+    if "only" not in query:
+        return None
+    return [
+        int(position) for position in re.split(r"[\s,]+", query["only"][0]) if position
+    ]
+
+
+def get_lazy_playlist(
+    plan: PlaylistPlan,
+    *,
+    base_url: str,
+    quality: Quality = Quality.q720,
+) -> Playlist:
+    return Playlist(
+        title=plan.title,
+        videos=[
+            PlaylistVideo(
+                id=position,
+                title=plan.titles.get(position, str(position)),
+                location=(
+                    f"{base_url}/episode/{plan.release_id}/{plan.source_id}/{position}"
+                    f"?{urlencode({'quality': quality.value})}"
+                ),
+            )
+            for position in plan.positions
+        ],
+    )
+
+
+def serve(
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    quality: Quality = Quality.q720,
+    cache: ResponseCache | None = None,
+    verbose: bool = False,
+) -> None:
+    # NOTE: resolved links are kept until Kodik expires them, even without a disk cache
+    cache = cache if cache is not None else MemoryCache()
+
+    with (
+        Client(cache=cache, video_links_cache=VideoLinksCache(cache)) as client,
+        PlaylistServer(
+            (host, port),
+            client=client,
+            quality=quality,
+            verbose=verbose,
+        ) as server,
+    ):
+        server.serve_forever()
+
+
+__all__ = (
+    PLAYLIST_FORMATS,
+    PlaylistRequestHandler,
+    PlaylistServer,
+    get_positions,
+    get_lazy_playlist,
+    serve,
+)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from typing import Awaitable, Callable, Hashable
+
+
+class Flight:
+    def __init__(self) -> None:
+        self.done: threading.Event = threading.Event()
+        self.result: object = None
+        self.exception: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.flights: dict[Hashable, Flight] = {}
+
+    def do[Result](
+        self,
+        key: Hashable,
+        call: Callable[[], Result],
+    ) -> tuple[Result, bool]:
+        # NOTE: returns the result and whether it was shared with an earlier caller
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result, True
+
+        try:
+            flight.result = call()
+        except BaseException as exception:
+            flight.exception = exception
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+        return flight.result, False
+
+
+class AsyncSingleFlight:
+    def __init__(self) -> None:
+        self.flights: dict[Hashable, asyncio.Future] = {}
+
+    async def do[Result](
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Result]],
+    ) -> tuple[Result, bool]:
+        while (future := self.flights.get(key)) is not None:
+            try:
+                # NOTE: shielded, so a cancelled waiter does not cancel the flight
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # NOTE: the leader was cancelled, the next waiter takes over
+
+        future = asyncio.get_running_loop().create_future()
+        self.flights[key] = future
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exception:
+            future.set_exception(exception)
+            # NOTE: marks the exception as retrieved when nobody is waiting
+            future.exception()
+            raise
+        finally:
+            del self.flights[key]
+
+        future.set_result(result)
+        return result, False
+
+
+__all__ = (
+    Flight,
+    SingleFlight,
+    AsyncSingleFlight,
+)
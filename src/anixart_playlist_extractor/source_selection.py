@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel, ValidationError
+
+from anixart_playlist_extractor.cache import DAY, default_cache_dir
+from anixart_playlist_extractor.client import Client
+from anixart_playlist_extractor.exceptions import AnixartPlaylistExtractorError
+from anixart_playlist_extractor.models import EpisodeSummary, EpisodesSummaryResponse
+from anixart_playlist_extractor.utils import (
+    assert_code,
+    atomic_write,
+    parse_episode_url,
+)
+
+SOURCE_CHOICE_TTL = DAY
+SOURCE_CHOICES_FILENAME = "sources.json"
+
+
+class SourceProbe(BaseModel):
+    source_id: int
+    episodes: list[EpisodeSummary] | None = None
+    latency: float | None = None
+    error: str | None = None
+
+
+class SourceChoice(BaseModel):
+    source_id: int
+    episodes: int
+    latency: float
+    chosen_at: float
+
+
+class SourceChoicesData(BaseModel):
+    choices: dict[str, SourceChoice] = {}
+
+
+class SourceChoiceStore:
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        ttl: float = SOURCE_CHOICE_TTL,
+    ) -> None:
+        # NOTE: `path=None` keeps the choices in memory only
+        self.path: str | None = path
+        self.ttl: float = ttl
+        self.lock: threading.Lock = threading.Lock()
+        self.choices: dict[str, SourceChoice] = self.load()
+
+    def key(self, release_id: int, type_id: int) -> str:
+        return f"{release_id}:{type_id}"
+
+    def get(self, release_id: int, type_id: int) -> SourceChoice | None:
+        choice = self.choices.get(self.key(release_id, type_id))
+
+        if choice is None or time.time() - choice.chosen_at > self.ttl:
+            return None
+
+        return choice
+
+    def set(self, release_id: int, type_id: int, choice: SourceChoice) -> None:
+        with self.lock:
+            self.choices[self.key(release_id, type_id)] = choice
+            self.save()
+
+    def load(self) -> dict[str, SourceChoice]:
+        if self.path is None:
+            return {}
+
+        try:
+            with open(self.path, "rb") as file:
+                return SourceChoicesData.model_validate_json(file.read()).choices
+        except (OSError, ValidationError):
+            return {}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with atomic_write(self.path) as file:
+            file.write(SourceChoicesData(choices=self.choices).model_dump_json())
+
+
+def default_source_choices_path() -> str:
+    return os.path.join(default_cache_dir(), SOURCE_CHOICES_FILENAME)
+
+
+def probe_source(
+    client: Client,
+    release_id: int,
+    type_id: int,
+    source_id: int,
+    *,
+    expires_at: float | None = None,
+) -> SourceProbe:
+    try:
+        episodes = client.get_episodes(
+            release_id,
+            type_id,
+            source_id,
+            response_model=EpisodesSummaryResponse,
+            expires_at=expires_at,
+        )
+        assert_code(episodes)
+
+        if not episodes.episodes:
+            return SourceProbe(source_id=source_id, episodes=[], error="No episodes")
+
+        # NOTE: the latest episode is the one most likely to be missing on Kodik
+        sample = max(episodes.episodes, key=lambda episode: episode.position)
+
+        link = parse_episode_url(sample.url)
+
+        # NOTE: cached links would make any source look instant
+        started = time.perf_counter()
+        client.get_video_links(*link, use_cache=False, expires_at=expires_at)
+        latency = time.perf_counter() - started
+    except AnixartPlaylistExtractorError as exception:
+        return SourceProbe(source_id=source_id, error=str(exception))
+    except (KeyError, ValueError) as exception:
+        return SourceProbe(
+            source_id=source_id,
+            error=f"Malformed episode url: {exception!r}",
+        )
+
+    return SourceProbe(
+        source_id=source_id,
+        episodes=episodes.episodes,
+        latency=latency,
+    )
+
+
+def probe_sources(
+    client: Client,
+    release_id: int,
+    type_id: int,
+    source_ids: list[int],
+    *,
+    expires_at: float | None = None,
+) -> list[SourceProbe]:
+    # NOTE: a probe that runs out of time is reported as failed like any other
+    with ThreadPoolExecutor(max_workers=max(1, len(source_ids))) as executor:
+        return list(
+            executor.map(
+                lambda source_id: probe_source(
+                    client,
+                    release_id,
+                    type_id,
+                    source_id,
+                    expires_at=expires_at,
+                ),
+                source_ids,
+            )
+        )
+
+
+def choose_source(probes: list[SourceProbe]) -> SourceProbe | None:
+    probes = [probe for probe in probes if probe.error is None]
+    if not probes:
+        return None
+
+    # NOTE: a source missing episodes loses to any complete one, however fast it is;
+    # ties keep the order Anixart lists the sources in
+    complete = max(len(probe.episodes) for probe in probes)
+    return min(
+        (probe for probe in probes if len(probe.episodes) == complete),
+        key=lambda probe: probe.latency,
+    )
+
+
+__all__ = (
+    SOURCE_CHOICE_TTL,
+    SOURCE_CHOICES_FILENAME,
+    SourceProbe,
+    SourceChoice,
+    SourceChoicesData,
+    SourceChoiceStore,
+    default_source_choices_path,
+    probe_source,
+    probe_sources,
+    choose_source,
+)
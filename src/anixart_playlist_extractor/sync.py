@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from anixart_playlist_extractor.client import DEFAULT_POOL_SIZE, Client
+from anixart_playlist_extractor.exceptions import AnixartPlaylistExtractorError
+from anixart_playlist_extractor.metadata_store import MetadataStore
+from anixart_playlist_extractor.models import (
+    EpisodeSummary,
+    EpisodesSummaryResponse,
+    ReleaseSummaryResponse,
+    Source,
+)
+from anixart_playlist_extractor.type_catalog import list_release_types
+from anixart_playlist_extractor.utils import assert_code, get_release_last_update
+
+
+class SyncResult(BaseModel):
+    release_id: int
+    changed: bool = False
+    types: int = 0
+    sources: int = 0
+    episodes: int = 0
+    error: str | None = None
+
+
+def sync_release(
+    client: Client,
+    store: MetadataStore,
+    release_id: int,
+    *,
+    force: bool = False,
+) -> SyncResult:
+    release = client.get_release(release_id, response_model=ReleaseSummaryResponse)
+    assert_code(release)
+
+    # NOTE: only `/release` is requested for releases that did not change since the
+    # last sync
+    stored = store.get_release(release_id)
+    last_update = get_release_last_update(release.release)
+    if (
+        not force
+        and stored is not None
+        and last_update is not None
+        and last_update == get_release_last_update(stored)
+    ):
+        return SyncResult(release_id=release_id)
+
+    # NOTE: falls back to episode updates for releases banned in the region
+    types = list_release_types(client, release_id)
+
+    sources: dict[int, list[Source]] = {}
+    episodes: dict[tuple[int, int], list[EpisodeSummary]] = {}
+
+    for type in types:
+        episode_sources = client.get_episode_sources(release_id, type.id)
+        assert_code(episode_sources)
+        sources[type.id] = episode_sources.sources
+
+        for source in episode_sources.sources:
+            source_episodes = client.get_episodes(
+                release_id,
+                type.id,
+                source.id,
+                response_model=EpisodesSummaryResponse,
+            )
+            assert_code(source_episodes)
+            episodes[type.id, source.id] = source_episodes.episodes
+
+    store.put_snapshot(release.release, types, sources, episodes)
+
+    return SyncResult(
+        release_id=release_id,
+        changed=True,
+        types=len(types),
+        sources=sum(len(type_sources) for type_sources in sources.values()),
+        episodes=sum(len(source_episodes) for source_episodes in episodes.values()),
+    )
+
+
+def sync_releases(
+    release_ids: list[int],
+    *,
+    client: Client,
+    store: MetadataStore,
+    max_workers: int = 4,
+    force: bool = False,
+) -> list[SyncResult]:
+    def sync(release_id: int) -> SyncResult:
+        try:
+            return sync_release(client, store, release_id, force=force)
+        except AnixartPlaylistExtractorError as exception:
+            return SyncResult(release_id=release_id, error=str(exception))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(sync, release_ids))
+
+
+def sync_store(
+    release_ids: list[int] | None = None,
+    *,
+    store_path: str | None = None,
+    max_workers: int = 4,
+    force: bool = False,
+) -> list[SyncResult]:
+    # NOTE: the store replaces the response cache here, every request goes to Anixart
+    with (
+        MetadataStore(store_path) as store,
+        Client(pool_size=max(max_workers, DEFAULT_POOL_SIZE)) as client,
+    ):
+        return sync_releases(
+            release_ids if release_ids else store.release_ids(),
+            client=client,
+            store=store,
+            max_workers=max_workers,
+            force=force,
+        )
+
+
+__all__ = (
+    SyncResult,
+    sync_release,
+    sync_releases,
+    sync_store,
+)
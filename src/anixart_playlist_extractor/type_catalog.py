@@ -0,0 +1,189 @@
+import difflib
+import os
+import re
+import time
+import unicodedata
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel, ValidationError
+
+from anixart_playlist_extractor.cache import DAY, default_cache_dir
+from anixart_playlist_extractor.client import Client
+from anixart_playlist_extractor.exceptions import RequestError
+from anixart_playlist_extractor.models import Type
+from anixart_playlist_extractor.utils import (
+    add_episode_update_types,
+    assert_code,
+    atomic_write,
+)
+
+TYPE_CATALOG_TTL = 3 * DAY
+TYPE_CATALOG_FILENAME = "types.json"
+
+NAME_SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+
+
+class TypeCatalogData(BaseModel):
+    updated_at: float
+    types: list[Type]
+
+
+def normalize_type_name(name: str) -> str:
+    name = unicodedata.normalize("NFKC", name).casefold().replace("ё", "е")
+    return NAME_SEPARATOR_PATTERN.sub(" ", name).strip()
+
+
+class TypeCatalog:
+    def __init__(self, types: list[Type], *, updated_at: float | None = None) -> None:
+        self.updated_at: float = updated_at if updated_at is not None else time.time()
+        self.types: dict[int, Type] = {type.id: type for type in types}
+        self.names: dict[str, list[Type]] = {}
+
+        for type in self.types.values():
+            self.names.setdefault(normalize_type_name(type.name), []).append(type)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def is_stale(self, ttl: float = TYPE_CATALOG_TTL) -> bool:
+        return time.time() - self.updated_at > ttl
+
+    def get(self, type_id: int) -> Type | None:
+        return self.types.get(type_id)
+
+    def find(self, name: str) -> list[Type]:
+        return list(self.names.get(normalize_type_name(name), []))
+
+    def search(self, query: str, *, limit: int | None = 20) -> list[Type]:
+        # NOTE: ranked: exact name, name prefix, word prefix, substring, fuzzy
+        query = normalize_type_name(query)
+        if not query:
+            return []
+
+        ranked: list[tuple[int, str]] = []
+        for name in self.names:
+            if name == query:
+                ranked.append((0, name))
+            elif name.startswith(query):
+                ranked.append((1, name))
+            elif any(word.startswith(query) for word in name.split()):
+                ranked.append((2, name))
+            elif query in name:
+                ranked.append((3, name))
+
+        names = [name for _, name in sorted(ranked)]
+        if not names:
+            names = difflib.get_close_matches(query, self.names, n=limit or 20)
+
+        types = [type for name in names for type in self.names[name]]
+        return types if limit is None else types[:limit]
+
+    @classmethod
+    def load(cls, path: str) -> "TypeCatalog | None":
+        try:
+            with open(path, "rb") as file:
+                data = TypeCatalogData.model_validate_json(file.read())
+        except (OSError, ValidationError):
+            return None
+
+        return cls(data.types, updated_at=data.updated_at)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with atomic_write(path) as file:
+            file.write(
+                TypeCatalogData(
+                    updated_at=self.updated_at,
+                    types=list(self.types.values()),
+                ).model_dump_json(by_alias=True)
+            )
+
+
+def default_type_catalog_path() -> str:
+    return os.path.join(default_cache_dir(), TYPE_CATALOG_FILENAME)
+
+
+def load_type_catalog(
+    client: Client,
+    *,
+    path: str | None = None,
+    ttl: float = TYPE_CATALOG_TTL,
+    refresh: bool = False,
+) -> TypeCatalog:
+    # NOTE: `path=None` keeps the catalog in memory only
+    catalog = TypeCatalog.load(path) if path is not None else None
+
+    if catalog is not None and not refresh and not catalog.is_stale(ttl):
+        return catalog
+
+    try:
+        type_all = client.get_type_all()
+        assert_code(type_all)
+    except RequestError:
+        # NOTE: a stale catalog is better than none when Anixart is unreachable
+        if catalog is not None:
+            return catalog
+        raise
+
+    catalog = TypeCatalog(type_all.types)
+    if path is not None:
+        catalog.save(path)
+
+    return catalog
+
+
+def list_release_types(
+    client: Client,
+    release_id: int,
+    *,
+    pages_max: int = 2,
+    max_workers: int = 1,
+) -> list[Type]:
+    # --- classic method ---
+    episode_types = client.get_episode_types(release_id)
+
+    if episode_types.code == 0:
+        return sorted(episode_types.types, key=lambda type: type.name)
+
+    # --- workaround (for releases banned in the region) ---
+    types: dict[int, Type] = {}
+    last_page = pages_max
+    wave_size = max(max_workers, 1)
+    first_page, pages_count = 1, 1
+
+    with ThreadPoolExecutor(max_workers=wave_size) as executor:
+        # NOTE: the first page alone tells `total_page_count`, the rest go in waves
+        while first_page <= last_page:
+            pages = range(first_page, min(first_page + pages_count, last_page + 1))
+            added = False
+
+            for episode_updates in executor.map(
+                lambda page: client.get_episode_updates(release_id, page=page),
+                pages,
+            ):
+                assert_code(episode_updates)
+                last_page = min(last_page, episode_updates.total_page_count)
+                if add_episode_update_types(types, episode_updates.content):
+                    added = True
+
+            # NOTE: stop early once a whole wave of pages brings no new types
+            if not added:
+                break
+
+            first_page, pages_count = pages.stop, wave_size
+
+    return sorted(types.values(), key=lambda type: type.name)
+
+
+__all__ = (
+    TYPE_CATALOG_TTL,
+    TYPE_CATALOG_FILENAME,
+    TypeCatalogData,
+    TypeCatalog,
+    normalize_type_name,
+    default_type_catalog_path,
+    load_type_catalog,
+    list_release_types,
+)
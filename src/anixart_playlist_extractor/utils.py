@@ -0,0 +1,185 @@
+import os
+import time
+import uuid
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TextIO
+from urllib.parse import urlparse
+
+from anixart_playlist_extractor.enums import Quality
+from anixart_playlist_extractor.exceptions import (
+    AnixartResponseError,
+    DeadlineExceededError,
+)
+from anixart_playlist_extractor.models import (
+    AnixartResponse,
+    Episode,
+    EpisodeSummary,
+    EpisodeUpdate,
+    ReleaseSummary,
+    Type,
+    VideoLinksResponse,
+)
+
+
+def assert_code[ResponseModel: AnixartResponse](response: ResponseModel) -> None:
+    if response.code != 0:
+        raise AnixartResponseError(code=response.code)
+
+
+def clean_filename(
+    filename: str,
+    *,
+    replace_char: str = "",
+) -> str:
+    illegal_chars = r'<>:"/\|?*'
+
+    for illegal_char in illegal_chars:
+        filename = filename.replace(illegal_char, replace_char)
+
+    return filename
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[TextIO]:
+    # NOTE: write next to the target and rename, so readers never see a partial file
+    directory, filename = os.path.split(os.path.abspath(path))
+    temp_path = os.path.join(directory, f".{filename}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        with open(temp_path, "x", encoding="utf-8") as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def get_expires_at(deadline: float | None) -> float | None:
+    # NOTE: `deadline` is a budget in seconds, `expires_at` a `time.monotonic()` value
+    return time.monotonic() + deadline if deadline is not None else None
+
+
+def get_remaining(expires_at: float | None) -> float | None:
+    return max(0.0, expires_at - time.monotonic()) if expires_at is not None else None
+
+
+def stop_at_deadline[Resolved](
+    resolved: Iterable[Resolved],
+    errors: list[DeadlineExceededError],
+) -> Iterator[Resolved]:
+    # NOTE: ends the stream instead of failing, so the playlist is still written with
+    # the resolved episodes; the caller raises the collected error afterwards
+    try:
+        yield from resolved
+    except DeadlineExceededError as exception:
+        errors.append(exception)
+
+
+def add_episode_update_types(
+    types: dict[int, Type],
+    episode_updates: list[EpisodeUpdate],
+) -> bool:
+    # NOTE: returns whether any new type was added
+    added = False
+
+    for episode_update in episode_updates:
+        if episode_update.last_episode_type_update_id in types:
+            continue
+
+        types[episode_update.last_episode_type_update_id] = Type.model_validate(
+            {
+                "@id": 0,
+                "id": episode_update.last_episode_type_update_id,
+                "name": episode_update.lastEpisodeTypeUpdateName,
+                "icon": None,
+                "workers": None,
+                "is_sub": False,
+                "episodes_count": 0,
+                "view_count": 0,
+                "pinned": False,
+            }
+        )
+        added = True
+
+    return added
+
+
+def get_timestamp(value: object) -> int | None:
+    return int(value) if isinstance(value, int | float) else None
+
+
+def get_release_last_update(release: ReleaseSummary) -> int | None:
+    # NOTE: the type of `episode_last_update` is unknown, anything else is ignored
+    timestamps = [
+        timestamp
+        for value in (release.last_update_date, release.episode_last_update)
+        if (timestamp := get_timestamp(value)) is not None
+    ]
+
+    return max(timestamps) if timestamps else None
+
+
+def parse_episode_url(url: str) -> tuple[str, str, str, str]:
+    parse_result = urlparse(url)
+
+    netloc = parse_result.netloc
+    path = parse_result.path
+    params = {
+        key: value
+        for key, value in map(
+            lambda param: tuple(param.split("=")),
+            parse_result.query.split("&"),
+        )
+    }
+
+    return f"//{netloc}{path}", params["d"], params["s"], params["ip"]
+
+
+def select_episodes[EpisodeModel: Episode | EpisodeSummary](
+    episodes: list[EpisodeModel],
+    *,
+    extract_only: list[int] | None = None,
+    extract_last: bool | None = None,
+) -> list[EpisodeModel]:
+    return (
+        episodes[-1:]
+        if extract_last
+        else [episode for episode in episodes if episode.position in extract_only]
+        if extract_only
+        else episodes
+    )
+
+
+def get_video_link(
+    video_links: VideoLinksResponse,
+    *,
+    quality: Quality = Quality.q720,
+) -> str:
+    # TODO: find easier way to get `Src` field
+    match quality:
+        case Quality.q360:
+            video_link = video_links.links.field_360.Src
+        case Quality.q480:
+            video_link = video_links.links.field_480.Src
+        case Quality.q720:
+            video_link = video_links.links.field_720.Src
+
+    return f"https:{video_link}"
+
+
+__all__ = (
+    assert_code,
+    clean_filename,
+    atomic_write,
+    get_expires_at,
+    get_remaining,
+    stop_at_deadline,
+    add_episode_update_types,
+    get_timestamp,
+    get_release_last_update,
+    parse_episode_url,
+    select_episodes,
+    get_video_link,
+)
@@ -0,0 +1,111 @@
+import re
+import time
+
+from datetime import datetime, timedelta, timezone
+
+from anixart_playlist_extractor.cache import (
+    HOUR,
+    MINUTE,
+    CacheEntry,
+    MemoryCache,
+    ResponseCache,
+    cache_key,
+)
+from anixart_playlist_extractor.models import VideoLinksResponse
+
+# NOTE: Kodik signs links as `//<cdn>/<path>/<hash>:<YYYYMMDDHH>/<quality>.mp4:hls:...`
+KODIK_EXPIRY_PATTERN = re.compile(r":(\d{10})/")
+# NOTE: timezone of the expiry stamp is unknown; MSK is the earliest plausible one
+KODIK_EXPIRY_TIMEZONE = timezone(timedelta(hours=3))
+
+
+class VideoLinksCache:
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        *,
+        margin: float = 10 * MINUTE,
+        default_ttl: float = 4 * HOUR,
+    ) -> None:
+        self.cache: ResponseCache = cache if cache is not None else MemoryCache()
+        self.margin: float = margin
+        self.default_ttl: float = default_ttl
+
+    def key(self, link: str, d: str, s: str, ip: str) -> str:
+        return cache_key(f"video_links:{link}", {"d": d, "s": s, "ip": ip})
+
+    def get(self, link: str, d: str, s: str, ip: str) -> VideoLinksResponse | None:
+        entry = self.cache.get(self.key(link, d, s, ip))
+
+        if entry is None or not entry.is_fresh():
+            return None
+
+        return VideoLinksResponse.model_validate_json(entry.content)
+
+    def set(
+        self,
+        link: str,
+        d: str,
+        s: str,
+        ip: str,
+        video_links: VideoLinksResponse,
+    ) -> None:
+        expires_at = get_video_links_expiry(video_links)
+
+        # NOTE: `default_ttl` is only a guess for links without a readable expiry
+        if expires_at is None:
+            expires_at = time.time() + self.default_ttl
+
+        # NOTE: links that are already (or about to be) dead are not worth keeping
+        if expires_at - self.margin <= time.time():
+            return
+
+        self.cache.set(
+            self.key(link, d, s, ip),
+            CacheEntry(
+                content=video_links.model_dump_json(by_alias=True).encode(),
+                expires_at=expires_at - self.margin,
+            ),
+        )
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def get_link_expiry(link: str) -> float | None:
+    match = KODIK_EXPIRY_PATTERN.search(link)
+
+    if match is None:
+        return None
+
+    try:
+        return (
+            datetime.strptime(match.group(1), "%Y%m%d%H")
+            .replace(tzinfo=KODIK_EXPIRY_TIMEZONE)
+            .timestamp()
+        )
+    except ValueError:
+        return None
+
+
+def get_video_links_expiry(video_links: VideoLinksResponse) -> float | None:
+    expiries = [
+        expiry
+        for links_field in (
+            video_links.links.field_360,
+            video_links.links.field_480,
+            video_links.links.field_720,
+        )
+        if (expiry := get_link_expiry(links_field.Src)) is not None
+    ]
+
+    return min(expiries) if expiries else None
+
+
+__all__ = (
+    KODIK_EXPIRY_PATTERN,
+    KODIK_EXPIRY_TIMEZONE,
+    VideoLinksCache,
+    get_link_expiry,
+    get_video_links_expiry,
+)
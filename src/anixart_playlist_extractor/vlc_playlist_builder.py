@@ -1,36 +1,88 @@
-from jinja2 import Template
-from anixart_playlist_extractor.models import Playlist
+import io
 
+from typing import Iterable, TextIO
+from xml.sax.saxutils import escape
 
-PLAYLIST_TEMPLATE = Template("""<?xml version="1.0" encoding="UTF-8"?>
+from anixart_playlist_extractor.models import Playlist, PlaylistVideo
+from anixart_playlist_extractor.utils import atomic_write
+
+
+PLAYLIST_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
 <playlist xmlns="http://xspf.org/ns/0/"
 	xmlns:vlc="http://www.videolan.org/vlc/playlist/ns/0/" version="1">
-	<title>{{ playlist.title }}</title>
+	<title>{title}</title>
 	<trackList>
-
-		{% for video in playlist.videos %}
-		<track>
-			<location>{{ video.location }}</location>
-			<title>{{ video.title }}</title>
+"""
+PLAYLIST_TRACK = """		<track>
+			<location>{location}</location>
+			<title>{title}</title>
 			<extension application="http://www.videolan.org/vlc/playlist/0">
-				<vlc:id>{{ video.id }}</vlc:id>
+				<vlc:id>{id}</vlc:id>
 			</extension>
 		</track>
-		{% endfor %}
-
-	</trackList>
+"""
+PLAYLIST_EXTENSION_HEADER = """	</trackList>
 	<extension application="http://www.videolan.org/vlc/playlist/0">
+"""
+PLAYLIST_ITEM = """		<vlc:item tid="{id}" />
+"""
+PLAYLIST_FOOTER = """	</extension>
+</playlist>
+"""
+
+
+class XSPFWriter:
+    def __init__(self, file: TextIO, title: str) -> None:
+        self.file: TextIO = file
+        self.title: str = title
+        # NOTE: only ids are kept to write `vlc:item`s after the track list
+        self.ids: list[int] = []
+
+    def __enter__(self):
+        self.file.write(PLAYLIST_HEADER.format(title=escape(self.title)))
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        if exception_type is None:
+            self.close()
+
+    def write_track(self, video: PlaylistVideo) -> None:
+        self.file.write(
+            PLAYLIST_TRACK.format(
+                location=escape(video.location),
+                title=escape(video.title),
+                id=video.id,
+            )
+        )
+        self.ids.append(video.id)
+
+    def close(self) -> None:
+        self.file.write(PLAYLIST_EXTENSION_HEADER)
+        for id in self.ids:
+            self.file.write(PLAYLIST_ITEM.format(id=id))
+        self.file.write(PLAYLIST_FOOTER)
 
-		{% for video in playlist.videos %}
-		<vlc:item tid="{{ video.id }}" />
-		{% endfor %}
 
-	</extension>
-</playlist>""")
+def write_playlist(
+    path: str,
+    title: str,
+    videos: Iterable[PlaylistVideo],
+) -> None:
+    with atomic_write(path) as file, XSPFWriter(file, title) as writer:
+        for video in videos:
+            writer.write_track(video)
 
 
 def build_playlist(playlist: Playlist) -> str:
-    return PLAYLIST_TEMPLATE.render(playlist=playlist.model_dump())
+    with io.StringIO() as file:
+        with XSPFWriter(file, playlist.title) as writer:
+            for video in playlist.videos:
+                writer.write_track(video)
+        return file.getvalue()
 
 
-__all__ = (build_playlist,)
+__all__ = (
+    XSPFWriter,
+    write_playlist,
+    build_playlist,
+)
@@ -0,0 +1,300 @@
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from pydantic import BaseModel
+
+from anixart_playlist_extractor.anixart_playlist_extractor import (
+    AnixartPlaylistExtractor,
+)
+from anixart_playlist_extractor.batch import BatchJob, load_manifest
+from anixart_playlist_extractor.cache import (
+    DAY,
+    DEFAULT_TTLS,
+    MINUTE,
+    ResponseCache,
+)
+from anixart_playlist_extractor.client import DEFAULT_POOL_SIZE, Client
+from anixart_playlist_extractor.models import ReleaseSummaryResponse
+from anixart_playlist_extractor.playlist_manifest import (
+    PlaylistManifestIndex,
+    find_playlist_manifest,
+    get_playlist_manifest_path,
+    index_playlist_manifests,
+)
+from anixart_playlist_extractor.utils import assert_code, get_release_last_update
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+# NOTE: releases updated within this window are treated as airing
+AIRING_WINDOW = 8 * DAY
+MIN_POLL_INTERVAL = 15 * MINUTE
+MAX_POLL_INTERVAL = DAY
+POLL_JITTER = 0.1
+
+# NOTE: watched endpoints must not be served from the response cache
+WATCH_TTLS: dict[str, float] = {
+    endpoint: ttl
+    for endpoint, ttl in DEFAULT_TTLS.items()
+    if endpoint not in ("release", "episodes")
+}
+
+
+class WatchState(BaseModel):
+    job: BatchJob
+    manifest_path: str | None = None
+    last_update: int | None = None
+    interval: float = MIN_POLL_INTERVAL
+    next_poll_at: float = 0.0
+    polls: int = 0
+    updates: int = 0
+    error: str | None = None
+
+
+class WatchEvent(BaseModel):
+    state: WatchState
+    path: str | None = None
+    episodes: int = 0
+    error: str | None = None
+
+
+type WatchHook = Callable[[WatchEvent], None]
+
+
+def get_poll_interval(
+    last_update: int | None,
+    *,
+    now: float | None = None,
+    min_interval: float = MIN_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+) -> float:
+    if last_update is None:
+        return min_interval
+
+    age = max(0.0, (now if now is not None else time.time()) - last_update)
+
+    # NOTE: the longer a release stays quiet, the more rarely it is polled
+    if age <= AIRING_WINDOW:
+        return min_interval
+    return min(max_interval, max(min_interval, age / 10))
+
+
+class Watcher:
+    def __init__(
+        self,
+        jobs: list[BatchJob],
+        *,
+        client: Client | None = None,
+        output_dir: str = "output",
+        max_workers: int = 8,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        hooks: list[WatchHook] | None = None,
+    ) -> None:
+        self.extractor: AnixartPlaylistExtractor = AnixartPlaylistExtractor(client)
+        self.output_dir: str = output_dir
+        self.max_workers: int = max_workers
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.hooks: list[WatchHook] = list(hooks or [])
+        self.states: list[WatchState] = [WatchState(job=job) for job in jobs]
+        self.stop_event: threading.Event = threading.Event()
+
+    @property
+    def client(self) -> Client:
+        return self.extractor.client
+
+    def get_output_dir(self, job: BatchJob) -> str:
+        return job.output_dir if job.output_dir is not None else self.output_dir
+
+    def poll(
+        self,
+        state: WatchState,
+        *,
+        manifest_index: PlaylistManifestIndex | None = None,
+    ) -> WatchEvent:
+        job = state.job
+        state.polls += 1
+
+        try:
+            release = self.client.get_release(
+                job.release_id,
+                response_model=ReleaseSummaryResponse,
+            )
+            assert_code(release)
+
+            last_update = get_release_last_update(release.release)
+            state.manifest_path = state.manifest_path or find_playlist_manifest(
+                self.get_output_dir(job),
+                job.release_id,
+                job.type_id,
+                quality=job.quality,
+                index=manifest_index,
+            )
+
+            # NOTE: the release did not change since the last poll, skip `get_episodes`
+            if (
+                state.manifest_path is not None
+                and last_update is not None
+                and last_update == state.last_update
+            ):
+                path, episodes = None, 0
+            elif state.manifest_path is None:
+                path, episodes = self.build(state)
+            else:
+                path, videos = self.extractor.update_playlist_videos(
+                    state.manifest_path,
+                    extract_only=job.extract_only,
+                    extract_last=job.extract_last,
+                )
+                episodes = len(videos)
+        except Exception as exception:
+            state.error = str(exception)
+            self.schedule(state, state.last_update)
+            return WatchEvent(state=state, error=state.error)
+
+        state.error = None
+        state.last_update = last_update
+        if episodes:
+            state.updates += 1
+        self.schedule(state, last_update)
+
+        return WatchEvent(
+            state=state,
+            path=path if episodes else None,
+            episodes=episodes,
+        )
+
+    def build(self, state: WatchState) -> tuple[str, int]:
+        job = state.job
+        plan = self.extractor.plan_playlist(
+            job.release_id,
+            job.type_id,
+            extract_only=job.extract_only,
+            extract_last=job.extract_last,
+        )
+        path = self.extractor.save_playlist(
+            plan,
+            self.extractor.iter_playlist_videos(
+                plan.release_id,
+                plan.source_id,
+                plan.positions,
+                quality=job.quality,
+            ),
+            quality=job.quality,
+            output_dir=self.get_output_dir(job),
+        )
+        state.manifest_path = get_playlist_manifest_path(path)
+
+        return path, len(plan.positions)
+
+    def schedule(self, state: WatchState, last_update: int | None) -> None:
+        state.interval = get_poll_interval(
+            last_update,
+            min_interval=self.min_interval,
+            max_interval=self.max_interval,
+        )
+        # NOTE: jitter spreads polls of releases that were subscribed together
+        state.next_poll_at = time.time() + state.interval * random.uniform(
+            1 - POLL_JITTER,
+            1 + POLL_JITTER,
+        )
+
+    def poll_due(self, executor: ThreadPoolExecutor) -> list[WatchEvent]:
+        now = time.time()
+        events = []
+        states = [state for state in self.states if state.next_poll_at <= now]
+
+        # NOTE: each output dir is scanned once per round, not once per subscription
+        indexes = {
+            output_dir: index_playlist_manifests(output_dir)
+            for output_dir in {
+                self.get_output_dir(state.job)
+                for state in states
+                if state.manifest_path is None
+            }
+        }
+
+        for event in executor.map(
+            lambda state: self.poll(
+                state,
+                manifest_index=indexes.get(self.get_output_dir(state.job)),
+            ),
+            states,
+        ):
+            for hook in self.hooks:
+                hook(event)
+            events.append(event)
+
+        return events
+
+    def run_once(self) -> list[WatchEvent]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return self.poll_due(executor)
+
+    def run(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self.stop_event.is_set():
+                self.poll_due(executor)
+
+                next_poll_at = min(
+                    (state.next_poll_at for state in self.states),
+                    default=time.time() + self.max_interval,
+                )
+                self.stop_event.wait(max(0.0, next_poll_at - time.time()))
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+def watch_manifest(
+    manifest_path: str,
+    *,
+    output_dir: str = "output",
+    max_workers: int = 8,
+    min_interval: float = MIN_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+    cache: ResponseCache | None = None,
+    hooks: list[WatchHook] | None = None,
+    once: bool = False,
+) -> Watcher:
+    jobs = load_manifest(manifest_path)
+
+    with Client(
+        cache=cache,
+        ttls=WATCH_TTLS,
+        video_links_cache=VideoLinksCache(cache) if cache is not None else None,
+        pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+    ) as client:
+        watcher = Watcher(
+            jobs,
+            client=client,
+            output_dir=output_dir,
+            max_workers=max_workers,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            hooks=hooks,
+        )
+
+        if once:
+            watcher.run_once()
+        else:
+            watcher.run()
+
+    return watcher
+
+
+__all__ = (
+    AIRING_WINDOW,
+    MIN_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+    WATCH_TTLS,
+    WatchState,
+    WatchEvent,
+    WatchHook,
+    get_poll_interval,
+    Watcher,
+    watch_manifest,
+)
@@ -0,0 +1,484 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from pydantic import BaseModel
+
+from anixart_playlist_extractor.anixart_playlist_extractor import (
+    AnixartPlaylistExtractor,
+)
+from anixart_playlist_extractor.batch import BatchJob, BatchJobResult, run_batch_job
+from anixart_playlist_extractor.cache import MINUTE, ResponseCache
+from anixart_playlist_extractor.client import DEFAULT_POOL_SIZE, Client
+from anixart_playlist_extractor.video_links_cache import VideoLinksCache
+
+VISIBILITY_TIMEOUT = 10 * MINUTE
+MAX_ATTEMPTS = 3
+RETRY_DELAY = MINUTE
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires_at REAL,
+    path TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_available_at ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_status_lease_expires_at
+    ON jobs (status, lease_expires_at);
+"""
+
+
+def get_job_key(job: BatchJob) -> str:
+    # NOTE: the same job enqueued twice is stored once
+    return job.model_dump_json()
+
+
+def get_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Lease(BaseModel):
+    id: int
+    token: str
+    job: BatchJob
+    attempts: int
+    expires_at: float
+
+
+class WorkerEvent(BaseModel):
+    lease: Lease
+    result: BatchJobResult
+    acked: bool
+
+
+type WorkerHook = Callable[[WorkerEvent], None]
+
+
+# NOTE: jobs are leased for `visibility_timeout` and delivered again unless acked,
+# so a backend only has to provide these operations atomically to be shared by any
+# number of workers (on as many hosts as the backend itself reaches)
+class WorkQueue(ABC):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+
+    @abstractmethod
+    def enqueue(self, jobs: list[BatchJob], *, requeue: bool = False) -> int: ...
+
+    @abstractmethod
+    def lease(
+        self,
+        owner: str,
+        *,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+    ) -> Lease | None: ...
+
+    @abstractmethod
+    def extend(
+        self,
+        lease: Lease,
+        *,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+    ) -> bool: ...
+
+    @abstractmethod
+    def ack(self, lease: Lease, *, path: str | None = None) -> bool: ...
+
+    @abstractmethod
+    def nack(
+        self,
+        lease: Lease,
+        *,
+        error: str,
+        retry_delay: float = RETRY_DELAY,
+    ) -> bool: ...
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]: ...
+
+    def close(self) -> None: ...
+
+
+# NOTE: SQLite in WAL mode needs a local disk (not NFS or SMB), so this backend is
+# shared only by workers running on the same machine
+class SQLiteWorkQueue(WorkQueue):
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_attempts: int = MAX_ATTEMPTS,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        self.path: str = path
+        self.max_attempts: int = max_attempts
+        self.lock: threading.Lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # NOTE: several processes share the file, writers wait for each other
+        # up to `busy_timeout`
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.connection.executescript(SCHEMA)
+
+    def enqueue(self, jobs: list[BatchJob], *, requeue: bool = False) -> int:
+        now = time.time()
+        # NOTE: `requeue` puts finished jobs back (e.g. for the next nightly run),
+        # jobs that are pending or leased are never duplicated
+        conflict = (
+            "DO UPDATE SET status = 'pending', attempts = 0, available_at = ?, "
+            "path = NULL, error = NULL, updated_at = ? "
+            "WHERE status IN ('done', 'failed')"
+            if requeue
+            else "DO NOTHING"
+        )
+
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                changes = self.connection.total_changes
+                for job in jobs:
+                    self.connection.execute(
+                        "INSERT INTO jobs (key, payload, available_at, updated_at) "
+                        f"VALUES (?, ?, ?, ?) ON CONFLICT (key) {conflict}",
+                        (
+                            get_job_key(job),
+                            job.model_dump_json(),
+                            now,
+                            now,
+                            *((now, now) if requeue else ()),
+                        ),
+                    )
+                added = self.connection.total_changes - changes
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+        return added
+
+    def lease(
+        self,
+        owner: str,
+        *,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+    ) -> Lease | None:
+        now = time.time()
+
+        with self.lock:
+            # NOTE: IMMEDIATE takes the write lock up front, so two workers never
+            # lease the same job
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                # NOTE: leases that expired without an ack are delivered again,
+                # or given up on after `max_attempts`
+                self.connection.execute(
+                    "UPDATE jobs SET status = 'failed', "
+                    "error = COALESCE(error, 'Lease expired'), updated_at = ? "
+                    "WHERE status = 'leased' AND lease_expires_at <= ? "
+                    "AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                row = self.connection.execute(
+                    "SELECT id, payload, attempts FROM jobs "
+                    "WHERE (status = 'pending' AND available_at <= ?) "
+                    "OR (status = 'leased' AND lease_expires_at <= ?) "
+                    "ORDER BY id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+
+                if row is None:
+                    self.connection.execute("COMMIT")
+                    return None
+
+                id, payload, attempts = row
+                lease = Lease(
+                    id=id,
+                    token=uuid.uuid4().hex,
+                    job=BatchJob.model_validate_json(payload),
+                    attempts=attempts + 1,
+                    expires_at=now + visibility_timeout,
+                )
+                self.connection.execute(
+                    "UPDATE jobs SET status = 'leased', attempts = ?, lease_owner = ?, "
+                    "lease_token = ?, lease_expires_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (lease.attempts, owner, lease.token, lease.expires_at, now, id),
+                )
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+        return lease
+
+    def extend(
+        self,
+        lease: Lease,
+        *,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+    ) -> bool:
+        expires_at = time.time() + visibility_timeout
+
+        if not self.update_leased(
+            lease,
+            "lease_expires_at = ?",
+            (expires_at,),
+        ):
+            return False
+
+        lease.expires_at = expires_at
+        return True
+
+    def ack(self, lease: Lease, *, path: str | None = None) -> bool:
+        # NOTE: False if the lease expired and the job was handed to another worker
+        return self.update_leased(
+            lease,
+            "status = 'done', path = ?, error = NULL, lease_expires_at = NULL",
+            (path,),
+        )
+
+    def nack(
+        self,
+        lease: Lease,
+        *,
+        error: str,
+        retry_delay: float = RETRY_DELAY,
+    ) -> bool:
+        if lease.attempts >= self.max_attempts:
+            return self.update_leased(
+                lease,
+                "status = 'failed', error = ?, lease_expires_at = NULL",
+                (error,),
+            )
+
+        # NOTE: back off linearly with the number of attempts
+        return self.update_leased(
+            lease,
+            "status = 'pending', error = ?, available_at = ?, lease_expires_at = NULL",
+            (error, time.time() + retry_delay * lease.attempts),
+        )
+
+    def update_leased(
+        self,
+        lease: Lease,
+        assignments: str,
+        values: tuple,
+    ) -> bool:
+        with self.lock:
+            cursor = self.connection.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                (*values, time.time(), lease.id, lease.token),
+            )
+
+        return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status ORDER BY status"
+            ).fetchall()
+
+        return dict(rows)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+WORK_QUEUE_BACKENDS: dict[str, Callable[..., WorkQueue]] = {
+    "sqlite": SQLiteWorkQueue,
+}
+
+
+def parse_work_queue_location(location: str) -> tuple[str, str]:
+    # NOTE: `<scheme>://<rest>` picks a backend from `WORK_QUEUE_BACKENDS`, a plain
+    # path is an SQLite file
+    scheme, separator, rest = location.partition("://")
+    if not separator:
+        scheme, rest = "sqlite", location
+
+    if scheme not in WORK_QUEUE_BACKENDS:
+        raise ValueError(f"Unknown work queue backend: {scheme}")
+
+    return scheme, rest
+
+
+def open_work_queue(location: str, *, max_attempts: int = MAX_ATTEMPTS) -> WorkQueue:
+    scheme, rest = parse_work_queue_location(location)
+
+    return WORK_QUEUE_BACKENDS[scheme](rest, max_attempts=max_attempts)
+
+
+class Worker:
+    def __init__(
+        self,
+        queue: WorkQueue,
+        *,
+        client: Client | None = None,
+        owner: str | None = None,
+        output_dir: str = "output",
+        max_workers: int = 1,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+        poll_interval: float = 5.0,
+        hooks: list[WorkerHook] | None = None,
+    ) -> None:
+        self.queue: WorkQueue = queue
+        self.extractor: AnixartPlaylistExtractor = AnixartPlaylistExtractor(client)
+        self.owner: str = owner if owner is not None else get_worker_name()
+        self.output_dir: str = output_dir
+        self.max_workers: int = max_workers
+        self.visibility_timeout: float = visibility_timeout
+        self.poll_interval: float = poll_interval
+        self.hooks: list[WorkerHook] = list(hooks or [])
+        self.stop_event: threading.Event = threading.Event()
+
+    def process(self, lease: Lease) -> WorkerEvent:
+        done = threading.Event()
+
+        # NOTE: the lease is extended while the job runs, so only a dead worker
+        # lets it expire
+        def heartbeat() -> None:
+            while not done.wait(self.visibility_timeout / 3):
+                if not self.queue.extend(
+                    lease,
+                    visibility_timeout=self.visibility_timeout,
+                ):
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+
+        try:
+            result = run_batch_job(
+                self.extractor,
+                lease.job,
+                output_dir=self.output_dir,
+            )
+        finally:
+            done.set()
+            thread.join()
+
+        # NOTE: playlists are written atomically to the same path, so a job that is
+        # delivered twice only rewrites its own output
+        acked = (
+            self.queue.ack(lease, path=result.path)
+            if result.ok
+            else self.queue.nack(lease, error=result.error)
+        )
+
+        event = WorkerEvent(lease=lease, result=result, acked=acked)
+        for hook in self.hooks:
+            hook(event)
+
+        return event
+
+    def run_loop(self, *, exit_when_empty: bool = False) -> int:
+        processed = 0
+
+        while not self.stop_event.is_set():
+            lease = self.queue.lease(
+                self.owner,
+                visibility_timeout=self.visibility_timeout,
+            )
+
+            if lease is None:
+                if exit_when_empty:
+                    break
+                self.stop_event.wait(self.poll_interval)
+                continue
+
+            self.process(lease)
+            processed += 1
+
+        return processed
+
+    def run(self, *, exit_when_empty: bool = False) -> int:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.run_loop, exit_when_empty=exit_when_empty)
+                for _ in range(self.max_workers)
+            ]
+
+            try:
+                return sum(future.result() for future in futures)
+            except KeyboardInterrupt:
+                # NOTE: jobs in progress are finished and acked before exiting
+                self.stop()
+                raise
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+def run_worker(
+    queue_location: str,
+    *,
+    output_dir: str = "output",
+    max_workers: int = 1,
+    visibility_timeout: float = VISIBILITY_TIMEOUT,
+    max_attempts: int = MAX_ATTEMPTS,
+    cache: ResponseCache | None = None,
+    hooks: list[WorkerHook] | None = None,
+    exit_when_empty: bool = False,
+) -> int:
+    with (
+        open_work_queue(queue_location, max_attempts=max_attempts) as queue,
+        Client(
+            cache=cache,
+            video_links_cache=VideoLinksCache(cache) if cache is not None else None,
+            pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+        ) as client,
+    ):
+        return Worker(
+            queue,
+            client=client,
+            output_dir=output_dir,
+            max_workers=max_workers,
+            visibility_timeout=visibility_timeout,
+            hooks=hooks,
+        ).run(exit_when_empty=exit_when_empty)
+
+
+__all__ = (
+    VISIBILITY_TIMEOUT,
+    MAX_ATTEMPTS,
+    RETRY_DELAY,
+    Lease,
+    WorkerEvent,
+    WorkerHook,
+    WorkQueue,
+    SQLiteWorkQueue,
+    WORK_QUEUE_BACKENDS,
+    parse_work_queue_location,
+    open_work_queue,
+    Worker,
+    get_job_key,
+    get_worker_name,
+    run_worker,
+)